@@ -1,6 +1,4 @@
 # smart_resume_analyser_final.py
-import io
-import re
 import streamlit as st
 # Hide the "Deploy" button and other Streamlit menu items
 hide_streamlit_style = """
@@ -15,145 +13,12 @@ st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 import plotly.graph_objects as go
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
-import PyPDF2
-
-# ----------------------------
-# Helper Functions (Backend)
-# ----------------------------
-# 🎨 Custom CSS for styling expander header
-
-
-def extract_text_from_pdf_bytes(file_bytes: bytes) -> str:
-    try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
-        pages_text = []
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                pages_text.append(page_text)
-        return "\n".join(pages_text).strip()
-    except Exception:
-        return ""
-
-def extract_name(text: str) -> str:
-    if not text:
-        return "Not found"
-    blacklist = {
-        "RESUME", "CURRICULUM VITAE", "CV", "CONTACT", "SUMMARY", "OBJECTIVE",
-        "EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "WORK", "PROFILE"
-    }
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    for line in lines[:8]:
-        up = line.upper()
-        if up in blacklist:
-            continue
-        if "@" in line or any(ch.isdigit() for ch in line):
-            continue
-        words = line.split()
-        if 1 <= len(words) <= 4:
-            if any(w[0].isupper() for w in words if w):
-                return line
-    return "Not found"
-
-def extract_email(text: str) -> str:
-    if not text:
-        return "Not found"
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
-    m = re.search(email_pattern, text, flags=re.IGNORECASE)
-    return m.group(0) if m else "Not found"
-
-def extract_phone(text: str) -> str:
-    if not text:
-        return "Not found"
-    patterns = [
-        r'(?<!\d)\+?\d{1,3}[-.\s]?\(?\d{2,4}\)?[-.\s]?\d{3,4}[-.\s]?\d{3,4}(?!\d)',
-        r'(?<!\d)\d{10}(?!\d)',
-    ]
-    for p in patterns:
-        m = re.search(p, text)
-        if m:
-            return m.group(0).strip()
-    return "Not found"
-
-def extract_skills(text: str):
-    if not text:
-        return []
-    skill_keywords = [
-        "Python", "Java", "C++", "C", "JavaScript", "HTML", "CSS", "React",
-        "Node.js", "Node", "SQL", "MongoDB", "PostgreSQL", "MySQL", "R", "Scala",
-        "AI", "ML", "Machine Learning", "Artificial Intelligence", "Data Science",
-        "Data Analysis", "Big Data", "Deep Learning", "Neural Networks",
-        "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras",
-        "Excel", "PowerBI", "Tableau", "Git", "Docker", "Kubernetes",
-        "AWS", "Azure", "GCP", "Linux", "Windows", "MacOS"
-    ]
-    found = set()
-    up = text.upper()
-    for sk in skill_keywords:
-        if sk.upper() in up:
-            found.add(sk)
-    return sorted(found)
-
-# ----------------------------
-# Improved ATS Scoring
-# ----------------------------
-
-def calculate_ats_score(skills, text, jd_text=""):
-    if not text:
-        return 0
-
-    score = 20  # base score for just having a resume
-
-    # ---- Skill Matching ----
-    jd_text_upper = jd_text.upper() if jd_text else ""
-    matched_skills = [s for s in skills if jd_text_upper and s.upper() in jd_text_upper]
-
-    if jd_text:  # If JD provided, weigh more on overlap
-        skill_match_score = min(len(matched_skills) * 8, 50)
-    else:  # If no JD, fallback to generic skill count
-        skill_match_score = min(len(skills) * 5, 40)
-
-    score += skill_match_score
-
-    # ---- Section Presence ----
-    section_keywords = ["experience", "education", "project", "certification"]
-    section_score = sum(5 for kw in section_keywords if kw in text.lower())
-    score += section_score
-
-    # ---- Penalties for Missing Sections ----
-    if "experience" not in text.lower():
-        score -= 5
-    if "education" not in text.lower():
-        score -= 5
-
-    # ---- Coverage Bonus ----
-    if jd_text and skills:
-        coverage = int((len(matched_skills) / max(1, len(set(jd_text.split())))) * 30)
-        score += coverage
-
-    # Final clamp
-    return max(0, min(score, 100))
-
-def improvement_suggestions(skills, all_skills, ats_score, jd_text=""):
-    suggestions = []
-    if ats_score < 60:
-        suggestions.append("🔴 ATS score is below average. Add more relevant skills & keywords.")
-    elif ats_score < 75:
-        suggestions.append("🟡 ATS score is good but can be improved with more technical skills.")
-    else:
-        suggestions.append("🟢 Great ATS score! Resume is fairly optimized.")
-
-    if jd_text:
-        suggestions.append("📌 Tailor your resume to better match the job description provided.")
-
-    missing = [s for s in all_skills if s not in skills]
-    if missing:
-        suggestions.append(f"💡 Consider adding: {', '.join(missing[:4])}")
-    if len(skills) < 5:
-        suggestions.append("📈 Add more technical skills to increase marketability.")
-
-    suggestions.append("✨ Use action verbs and quantify achievements.")
-    return suggestions
+from analyzer import (
+    analyze_many, analysis_key, evict_analyses, parse_resume_bytes, jd_skill_gap, filter_by_tenure, improvement_suggestions,
+)
+from profiling import profiling_enabled, profile_call, format_summary
+from warmup import analysis_pool, replace_analysis_pool, warm_up
+from concurrent.futures.process import BrokenProcessPool
 
 # ----------------------------
 # Streamlit UI (Frontend)
@@ -166,6 +31,32 @@ st.set_page_config(
     page_icon="📄"
 )
 
+# ----------------------------
+# Warm-up (once per server process)
+# ----------------------------
+
+@st.cache_resource(show_spinner="Warming up the analyzer...")
+def _warm_up():
+    # Preloads fonts, PDF libraries, matchers, models and the shared analysis
+    # pool's workers, then writes the readiness marker checked by
+    # `python warmup.py --check`. Started through `python warmup.py --serve`,
+    # this already happened before the first session.
+    return warm_up(port=st.get_option("server.port"))
+
+def _analyze_uploads(files, jd_text, cache, on_progress):
+    # One dead worker (e.g. OOM-killed) breaks the shared pool for every session:
+    # replace it and retry once; files finished before the crash stay cached
+    for attempt in range(2):
+        pool = analysis_pool()
+        try:
+            return analyze_many(files, jd_text, cache=cache, pool=pool, on_progress=on_progress)
+        except BrokenProcessPool:
+            replace_analysis_pool(pool)
+            if attempt:
+                raise
+
+warmup_report = _warm_up()
+
 # Custom CSS with professional styling and animations
 st.markdown("""
 <style>
@@ -554,11 +445,66 @@ st.markdown("""
 
 
 
-uploaded_file = st.file_uploader("", type=["pdf"], label_visibility="collapsed")
+uploaded_files = st.file_uploader("", type=["pdf"], accept_multiple_files=True, label_visibility="collapsed")
+
+if uploaded_files:
+    uploads = [(f.name, f.getvalue()) for f in uploaded_files]
+
+    # Parsed results live in the session, keyed by PDF hash: adding a file only
+    # parses that file and editing the JD only re-scores. Removed files are dropped.
+    cache = st.session_state.setdefault("analysis_cache", {})
+    profile_summaries = st.session_state.setdefault("profile_summaries", {})
+    evict_analyses(cache, [b for _, b in uploads])
+    evict_analyses(profile_summaries, [b for _, b in uploads])
+
+    # Opt-in profiling: RESUME_PROFILE=1 or the hidden ?profile=1 URL toggle.
+    # Only uploads not analyzed yet are profiled; widget reruns reuse the cache.
+    if profiling_enabled() or st.query_params.get("profile") == "1":
+        for _, file_bytes in uploads:
+            key = analysis_key(file_bytes)
+            if key not in cache:
+                cache[key], profile_summaries[key] = profile_call(file_bytes, parse_resume_bytes, file_bytes)
+
+    progress = st.progress(0, text="Analyzing resumes...")
+    analyses = _analyze_uploads(
+        [b for _, b in uploads], jd_text, cache,
+        on_progress=lambda done, total: progress.progress(done / total, text=f"Analyzed {done}/{total} resumes"),
+    )
+    progress.empty()
+
+    selected = 0
+    if len(uploads) > 1:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-title">
+                ⚖ Resume Comparison
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
 
-if uploaded_file is not None:
-    uploaded_bytes = uploaded_file.read()
-    extracted_text = extract_text_from_pdf_bytes(uploaded_bytes)
+        min_years = st.number_input("Minimum experience (years)", min_value=0.0, value=0.0, step=0.5)
+        records = [dict(result, file_name=file_name) for (file_name, _), result in zip(uploads, analyses)]
+
+        rows = []
+        for result in filter_by_tenure(records, min_years=min_years):
+            matched, missing = jd_skill_gap(result["skills"], jd_text)
+            rows.append({
+                "File": result["file_name"],
+                "Name": result["name"],
+                "ATS Score": result["ats_score"],
+                "Experience (yrs)": result["experience_years"],
+                "Skills Found": len(result["skills"]),
+                "JD Skill Coverage (%)": round(100 * len(matched) / max(1, len(matched) + len(missing))),
+                "Missing JD Skills": ", ".join(missing) or "-",
+            })
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+        names = [file_name for file_name, _ in uploads]
+        selected = st.selectbox("Show detailed analysis for", range(len(names)), format_func=lambda i: names[i])
+
+    analysis = analyses[selected]
+    profile_summary = profile_summaries.get(analysis_key(uploads[selected][1]))
+    extracted_text = analysis["text"]
 
     # Raw text preview
     with st.expander("🔍 View Extracted Text Preview"):
@@ -567,11 +513,17 @@ if uploaded_file is not None:
         else:
             st.warning("⚠ No selectable text found. Your PDF might be scanned. Try using a text-based PDF for better results.")
 
+    if profile_summary:
+        with st.expander("🧪 Profiling Summary"):
+            st.code(format_summary(profile_summary), language=None)
+            st.caption(f"Server warm-up took {warmup_report['warmup_seconds']:.2f}s: {warmup_report['steps']}")
+
     # Extract information
-    name = extract_name(extracted_text)
-    email = extract_email(extracted_text)
-    phone = extract_phone(extracted_text)
-    skills = extract_skills(extracted_text)
+    name = analysis["name"]
+    email = analysis["email"]
+    phone = analysis["phone"]
+    experience_years = analysis["experience_years"]
+    skills = analysis["skills"]
 
     # Information Display
     st.markdown("""
@@ -600,9 +552,27 @@ if uploaded_file is not None:
                 <span class="info-icon">📱</span>
                 <strong>Phone:</strong> {phone}
             </div>
+            <div class="info-item">
+                <span class="info-icon">💼</span>
+                <strong>Experience:</strong> {experience_years} years across {len(analysis["work_history"])} roles
+            </div>
         </div>
         """, unsafe_allow_html=True)
 
+        if analysis["organizations"] or analysis["locations"]:
+            st.markdown(f"""
+            <div class="info-card">
+                <div class="info-item">
+                    <span class="info-icon">🏢</span>
+                    <strong>Organizations:</strong> {", ".join(analysis["organizations"][:6]) or "-"}
+                </div>
+                <div class="info-item">
+                    <span class="info-icon">📍</span>
+                    <strong>Locations:</strong> {", ".join(analysis["locations"][:4]) or "-"}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
     with col2:
         st.markdown(f"""
         <div class="info-card">
@@ -616,7 +586,7 @@ if uploaded_file is not None:
             st.markdown(f'<div class="skills-container">{skills_html}</div>', unsafe_allow_html=True)
 
     # ATS Score Section
-    ats_score = calculate_ats_score(skills, extracted_text, jd_text)
+    ats_score = analysis["ats_score"]
 
     st.markdown("""
     <div class="section-card">
@@ -691,6 +661,20 @@ if uploaded_file is not None:
         )
 
 
+    with st.expander("📐 Score Breakdown"):
+        labels = {
+            "base": "Base score",
+            "skills": "Skill match",
+            "sections": "Sections present",
+            "missing_section_penalties": "Missing sections",
+            "experience": "Experience",
+            "coverage": "JD coverage bonus",
+        }
+        st.dataframe(
+            [{"Component": labels.get(k, k), "Points": v} for k, v in analysis["ats_breakdown"].items()],
+            use_container_width=True, hide_index=True,
+        )
+
     # Skills WordCloud
     st.markdown("""
     <div class="section-card">
@@ -809,3 +793,7 @@ if uploaded_file is not None:
 
         if not shown:
             st.info("No specific YouTube courses found for your skills. Try adding more technical keywords.")
+else:
+    # Nothing uploaded: release the cached texts of earlier uploads
+    st.session_state.pop("analysis_cache", None)
+    st.session_state.pop("profile_summaries", None)
@@ -0,0 +1,314 @@
+# analyzer.py
+# Backend helpers shared by the Streamlit app and the batch tools.
+# Importing this module must not pull in Streamlit.
+import datetime
+import hashlib
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scoring import default_policy, score_batch, score_breakdown, score_context
+import ner
+from contacts import normalize_contacts
+from document import AnalyzedDocument, Text, as_document
+
+# ----------------------------
+# Helper Functions (Backend)
+# ----------------------------
+
+
+def extract_text_from_pdf_bytes(file_bytes: bytes) -> str:
+    import PyPDF2  # imported here so the text-only helpers work without it
+
+    try:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+        pages_text = []
+        for page in pdf_reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                pages_text.append(page_text)
+        return "\n".join(pages_text).strip()
+    except Exception:
+        return ""
+
+# Extractors take a str or a shared AnalyzedDocument (document.py); analyze_resume
+# builds the document once so the case-folded views and lines are reused.
+
+_NAME_BLACKLIST = {
+    "RESUME", "CURRICULUM VITAE", "CV", "CONTACT", "SUMMARY", "OBJECTIVE",
+    "EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "WORK", "PROFILE"
+}
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', re.IGNORECASE)
+_PHONE_RES = [
+    re.compile(r'(?<!\d)\+?\d{1,3}[-.\s]?\(?\d{2,4}\)?[-.\s]?\d{3,4}[-.\s]?\d{3,4}(?!\d)'),
+    re.compile(r'(?<!\d)\d{10}(?!\d)'),
+]
+SKILL_KEYWORDS = [
+    "Python", "Java", "C++", "C", "JavaScript", "HTML", "CSS", "React",
+    "Node.js", "Node", "SQL", "MongoDB", "PostgreSQL", "MySQL", "R", "Scala",
+    "AI", "ML", "Machine Learning", "Artificial Intelligence", "Data Science",
+    "Data Analysis", "Big Data", "Deep Learning", "Neural Networks",
+    "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras",
+    "Excel", "PowerBI", "Tableau", "Git", "Docker", "Kubernetes",
+    "AWS", "Azure", "GCP", "Linux", "Windows", "MacOS"
+]
+_SKILLS_UPPER = [(sk, sk.upper()) for sk in SKILL_KEYWORDS]
+
+def extract_name(text: Text) -> str:
+    doc = as_document(text)
+    if not doc:
+        return "Not found"
+    for line in doc.lines[:8]:
+        up = line.upper()
+        if up in _NAME_BLACKLIST:
+            continue
+        if "@" in line or any(ch.isdigit() for ch in line):
+            continue
+        words = line.split()
+        if 1 <= len(words) <= 4:
+            if any(w[0].isupper() for w in words if w):
+                return line
+    return "Not found"
+
+def extract_email(text: Text) -> str:
+    doc = as_document(text)
+    if not doc:
+        return "Not found"
+    m = _EMAIL_RE.search(doc.text)
+    return m.group(0) if m else "Not found"
+
+def extract_phone(text: Text) -> str:
+    doc = as_document(text)
+    if not doc:
+        return "Not found"
+    for pattern in _PHONE_RES:
+        m = pattern.search(doc.text)
+        if m:
+            return m.group(0).strip()
+    return "Not found"
+
+def extract_skills(text: Text):
+    doc = as_document(text)
+    if not doc:
+        return []
+    up = doc.upper
+    return sorted(sk for sk, sk_up in _SKILLS_UPPER if sk_up in up)
+
+# ----------------------------
+# Work History & Tenure
+# ----------------------------
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+_DATE = (r"(?:\b(?P<{p}mon>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*"
+         r"|(?<!\d)(?P<{p}num>0?[1-9]|1[0-2])[/.-])?(?<!\d)(?P<{p}year>(?:19|20)\d{{2}})(?!\d)")
+_DATE_RANGE_RE = re.compile(
+    _DATE.format(p="s") + r"\s*(?:-|–|—|to|until|till)\s*"
+    r"(?:(?P<present>present|current|now|date|today)|" + _DATE.format(p="e") + r")",
+    re.IGNORECASE,
+)
+_EXPERIENCE_HEADING_RE = re.compile(
+    r"^\s*(?:professional\s+|work\s+)?(?:experience|employment(?:\s+history)?|work\s+history|career\s+history)\s*:?\s*$",
+    re.IGNORECASE,
+)
+_OTHER_HEADING_RE = re.compile(
+    r"^\s*(?:education|academics?|skills|technical\s+skills|projects|certifications?|"
+    r"achievements|awards|publications|interests|hobbies|languages|references|summary|objective)\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+def _month_index(m, prefix, end=False):
+    year = int(m.group(prefix + "year"))
+    if m.group(prefix + "mon"):
+        month = _MONTHS[m.group(prefix + "mon")[:3].lower()]
+    elif m.group(prefix + "num"):
+        month = int(m.group(prefix + "num")) - 1
+    else:
+        # A bare year covers the whole year: "2016 - 2018" is Jan 2016 to Dec 2018
+        return (year + 1) * 12 if end else year * 12
+    return year * 12 + month + (1 if end else 0)
+
+def _fmt_month(idx):
+    return f"{idx // 12:04d}-{idx % 12 + 1:02d}"
+
+def extract_work_history(text: Text, today=None) -> dict:
+    # One pass over the lines: track whether we are inside the experience
+    # section and collect every date range found there. Falls back to the
+    # whole text when the resume has no recognisable experience heading.
+    empty = {"roles": [], "total_months": 0, "total_years": 0.0}
+    doc = as_document(text)
+    if not doc:
+        return empty
+    today = today or datetime.date.today()
+    now = today.year * 12 + today.month  # exclusive end of the current month
+
+    in_section, saw_heading = False, False
+    section_roles, all_roles = [], []
+    prev_line = ""
+    for line in doc.lines:
+        if _EXPERIENCE_HEADING_RE.match(line):
+            in_section = saw_heading = True
+            prev_line = ""
+            continue
+        if in_section and _OTHER_HEADING_RE.match(line):
+            in_section = False
+        for m in _DATE_RANGE_RE.finditer(line):
+            start = _month_index(m, "s")
+            end = min(now if m.group("present") else _month_index(m, "e", end=True), now)
+            if end <= start or start >= now:
+                continue
+            title = (line[:m.start()] + line[m.end():]).strip(" \t|,-–—()")
+            role = {"title": title or prev_line, "start": _fmt_month(start), "end": _fmt_month(end - 1),
+                    "months": end - start, "_span": (start, end)}
+            (section_roles if in_section else all_roles).append(role)
+        prev_line = line
+
+    # With an experience heading only its ranges count (education dates must not
+    # become tenure), even if none were found there
+    roles = section_roles if saw_heading else all_roles
+    if not roles:
+        return empty
+
+    # Merge overlapping intervals so parallel jobs are not double-counted
+    total, cur_start, cur_end = 0, None, None
+    for start, end in sorted(r["_span"] for r in roles):
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                total += cur_end - cur_start
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    total += cur_end - cur_start
+    for r in roles:
+        del r["_span"]
+    return {"roles": roles, "total_months": total, "total_years": round(total / 12, 1)}
+
+def filter_by_tenure(records, min_years=0.0, max_years=None):
+    # Batch screening over analyze_resume()/score_resume() results
+    return [
+        r for r in records
+        if r.get("experience_years", 0.0) >= min_years
+        and (max_years is None or r.get("experience_years", 0.0) <= max_years)
+    ]
+
+# ----------------------------
+# Improved ATS Scoring
+# ----------------------------
+
+# Weights and rules live in scoring.py; these wrappers keep the old call shape.
+
+def ats_score_breakdown(skills, text, jd_text="", experience_years=None, policy=None):
+    ctx = score_context(skills, text, jd_text, experience_years)
+    return score_breakdown(ctx, policy)
+
+def calculate_ats_score(skills, text, jd_text="", experience_years=None, policy=None):
+    return ats_score_breakdown(skills, text, jd_text, experience_years, policy)["total"]
+
+# ----------------------------
+# Full Analysis of One Upload
+# ----------------------------
+
+def parse_resume_bytes(file_bytes: bytes, use_ner=None) -> dict:
+    # Everything that depends only on the PDF; scoring against a JD is separate
+    # (score_parsed), so a JD edit never re-parses an upload
+    text = extract_text_from_pdf_bytes(file_bytes)
+    doc = AnalyzedDocument(text)
+    skills = extract_skills(doc)
+    work = extract_work_history(doc)
+    # Optional spaCy entities (RESUME_USE_NER=1); the heuristics remain the fallback
+    entities = ner.extract_entities(text) if (ner.ner_enabled() if use_ner is None else use_ner) else None
+    return {
+        "text": text,
+        "name": (entities and entities["name"]) or extract_name(doc),
+        "organizations": entities["organizations"] if entities else [],
+        "locations": entities["locations"] if entities else [],
+        "email": extract_email(doc),
+        "phone": extract_phone(doc),
+        **normalize_contacts(doc),  # "emails" / "phones", normalized, all of them
+        "skills": skills,
+        "work_history": work["roles"],
+        "experience_years": work["total_years"],
+    }
+
+def score_parsed(parsed, jd_text: str = "", policy=None) -> list:
+    # parse_resume_bytes() results -> new dicts with "ats_score"/"ats_breakdown"
+    parsed = list(parsed)
+    rows = score_batch(parsed, [policy or default_policy()], jd_text)
+    return [dict(p, ats_score=row[0]["total"], ats_breakdown=row[0]["components"])
+            for p, row in zip(parsed, rows)]
+
+def analyze_resume(file_bytes: bytes, jd_text: str = "", use_ner=None) -> dict:
+    return score_parsed([parse_resume_bytes(file_bytes, use_ner)], jd_text)[0]
+
+def jd_skill_gap(skills, jd_text=""):
+    # Skills named in the JD split into those the resume has and those it lacks
+    jd_skills = extract_skills(jd_text)
+    have = set(skills)
+    matched = [s for s in jd_skills if s in have]
+    missing = [s for s in jd_skills if s not in have]
+    return matched, missing
+
+def analysis_key(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+def analyze_many(files, jd_text="", cache=None, max_workers=None, on_progress=None, pool=None):
+    # Analyzes several uploads in a process pool (PDF parsing is CPU-bound).
+    # `cache` maps analysis_key(pdf) -> parse_resume_bytes() result and is
+    # filled in place, so adding a file only parses that file and changing the
+    # JD only re-scores. Pass a long-lived `pool` (see warmup.warm_worker) to
+    # skip per-batch process start-up.
+    cache = {} if cache is None else cache
+    keys = [analysis_key(b) for b in files]
+    todo = {}
+    for key, file_bytes in zip(keys, files):
+        if key not in cache and key not in todo:
+            todo[key] = file_bytes
+
+    done = len(files) - len(todo)
+    if on_progress:
+        on_progress(done, len(files))
+    if len(todo) == 1:
+        (key, file_bytes), = todo.items()
+        cache[key] = parse_resume_bytes(file_bytes)
+        if on_progress:
+            on_progress(len(files), len(files))
+    elif todo:
+        own_pool = pool is None
+        pool = ProcessPoolExecutor(max_workers=max_workers) if own_pool else pool
+        try:
+            futures = {pool.submit(parse_resume_bytes, b): key for key, b in todo.items()}
+            for fut in as_completed(futures):
+                cache[futures[fut]] = fut.result()
+                done += 1
+                if on_progress:
+                    on_progress(done, len(files))
+        finally:
+            if own_pool:
+                pool.shutdown()
+    return score_parsed([cache[key] for key in keys], jd_text)
+
+def evict_analyses(cache, files):
+    # Drops cached parses of uploads that are no longer in `files`
+    keep = {analysis_key(b) for b in files}
+    for key in [k for k in cache if k not in keep]:
+        del cache[key]
+
+def improvement_suggestions(skills, all_skills, ats_score, jd_text=""):
+    suggestions = []
+    if ats_score < 60:
+        suggestions.append("🔴 ATS score is below average. Add more relevant skills & keywords.")
+    elif ats_score < 75:
+        suggestions.append("🟡 ATS score is good but can be improved with more technical skills.")
+    else:
+        suggestions.append("🟢 Great ATS score! Resume is fairly optimized.")
+
+    if jd_text:
+        suggestions.append("📌 Tailor your resume to better match the job description provided.")
+
+    missing = [s for s in all_skills if s not in skills]
+    if missing:
+        suggestions.append(f"💡 Consider adding: {', '.join(missing[:4])}")
+    if len(skills) < 5:
+        suggestions.append("📈 Add more technical skills to increase marketability.")
+
+    suggestions.append("✨ Use action verbs and quantify achievements.")
+    return suggestions
@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+import pytest
+
+# The benchmark modules skip themselves when fitz, PyPDF2 or pytest-benchmark
+# is missing (an importorskip here would abort the whole run instead), so the
+# corpus generator is only imported once a fixture actually needs it.
+
+# Corpus sizes (number of documents) every size-parametrized benchmark runs at
+CORPUS_SIZES = [1, 10, 50]
+
+
+@pytest.fixture(scope="session")
+def corpus_cache():
+    return {}
+
+
+@pytest.fixture(scope="session")
+def corpus_dir():
+    with tempfile.TemporaryDirectory(prefix="resume_corpus_") as d:
+        yield d
+
+
+@pytest.fixture(params=CORPUS_SIZES, ids=lambda n: f"{n}docs")
+def corpus(request, corpus_cache, corpus_dir):
+    # Same seed for every run, so results from different commits are comparable
+    n = request.param
+    if n not in corpus_cache:
+        from benchmarks.corpus import generate_corpus
+        docs = generate_corpus(n, seed=1234)
+        paths = []
+        for i, (_meta, data) in enumerate(docs):
+            path = os.path.join(corpus_dir, f"{n}_{i}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(data)
+            paths.append(path)
+        corpus_cache[n] = [(meta, data, path) for (meta, data), path in zip(docs, paths)]
+    return corpus_cache[n]
+
+
+@pytest.fixture(scope="session")
+def jd_text():
+    from benchmarks.corpus import generate_jd
+    return generate_jd(seed=1234)
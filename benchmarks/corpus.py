@@ -0,0 +1,188 @@
+# corpus.py
+# Synthetic resume corpus for benchmarks: text PDFs with varied layouts,
+# lengths (1-50 pages) and skill densities, generated deterministically from a seed.
+#
+#   python -m benchmarks.corpus out_dir --count 200 --seed 7
+import argparse
+import os
+import random
+import textwrap
+
+import fitz  # PyMuPDF, already used by resume_parser
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "John", "Maria", "Wei", "Fatima",
+               "Lucas", "Sofia", "Kenji", "Amara", "Noah", "Elena", "Arjun", "Chloe"]
+LAST_NAMES = ["Sharma", "Patel", "Smith", "Garcia", "Chen", "Khan", "Müller", "Rossi",
+              "Tanaka", "Okafor", "Brown", "Ivanova", "Mehta", "Silva", "Nguyen", "Kim"]
+COMPANIES = ["Infosys", "TCS", "Zomato", "Paytm", "Snowflake", "Oracle", "Acme Corp",
+             "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech"]
+TITLES = ["Software Engineer", "Data Scientist", "Frontend Developer", "ML Engineer",
+          "Backend Developer", "Data Analyst", "DevOps Engineer", "Android Developer"]
+DEGREES = ["B.Tech in Computer Science", "M.Sc in Data Science", "Bachelor of Engineering",
+           "Master of Computer Applications", "MBA in Business Analytics", "PhD in Statistics"]
+SKILLS = ["Python", "Java", "C++", "JavaScript", "HTML", "CSS", "React", "Node.js", "SQL",
+          "MongoDB", "PostgreSQL", "MySQL", "Machine Learning", "Deep Learning", "Data Science",
+          "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "Excel",
+          "Tableau", "Git", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Linux",
+          "Django", "Flask", "Kotlin", "Swift", "Figma"]
+FILLER = [
+    "Collaborated with cross-functional teams to deliver features on schedule",
+    "Improved reliability of internal tooling and reduced on-call load",
+    "Mentored junior colleagues and ran weekly knowledge-sharing sessions",
+    "Wrote design documents and presented trade-offs to stakeholders",
+    "Owned the release process and coordinated with quality assurance",
+    "Gathered requirements from customers and translated them into tasks",
+    "Reduced reporting turnaround time by automating manual steps",
+    "Participated in code reviews and maintained coding standards",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+LAYOUTS = ("single", "two_column", "sidebar")
+PAGE_W, PAGE_H = fitz.paper_size("a4")
+MARGIN = 40
+FONT_SIZE = 10
+LINE_H = FONT_SIZE * 1.35
+
+
+# ---------- TEXT GENERATION ----------
+def _bullet(rng, skill_density):
+    line = rng.choice(FILLER)
+    if rng.random() < skill_density:
+        picked = rng.sample(SKILLS, k=rng.randint(1, 3))
+        line += " using " + ", ".join(picked)
+    return "- " + line + "."
+
+
+def _date_range(rng, year):
+    start = f"{rng.choice(MONTHS)} {year}"
+    if rng.random() < 0.15:
+        return f"{start} - Present"
+    return f"{start} - {rng.choice(MONTHS)} {year + rng.randint(1, 4)}"
+
+
+def resume_sections(rng, pages, skill_density):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = name.lower().replace(" ", ".") + "@example.com"
+    phone = f"+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}"
+    header = [name, email, phone, ""]
+
+    skills = rng.sample(SKILLS, k=max(1, int(len(SKILLS) * skill_density)))
+    skill_lines = ["SKILLS"] + textwrap.wrap(", ".join(skills), 60) + [""]
+
+    # Roughly 55 lines per column-page; scale the experience section to fill `pages`
+    body = ["SUMMARY", _bullet(rng, skill_density)[2:], "", "EXPERIENCE"]
+    target_lines = pages * 55
+    year = 2024
+    while len(body) < target_lines - 12:
+        body.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}")
+        body.append(_date_range(rng, year))
+        year -= rng.randint(1, 3)
+        body.extend(_bullet(rng, skill_density) for _ in range(rng.randint(3, 8)))
+        body.append("")
+    body += ["EDUCATION", f"{rng.choice(DEGREES)}, {year - 4} - {year}", "",
+             "PROJECTS", _bullet(rng, skill_density), "",
+             "CERTIFICATIONS", f"{rng.choice(SKILLS)} Certified Professional"]
+    return header, skill_lines, body
+
+
+# ---------- PDF RENDERING ----------
+def _columns(layout):
+    inner = PAGE_W - 2 * MARGIN
+    if layout == "two_column":
+        half = (inner - 20) / 2
+        return [(MARGIN, half), (MARGIN + half + 20, half)]
+    if layout == "sidebar":
+        side = inner * 0.3
+        return [(MARGIN, side), (MARGIN + side + 15, inner - side - 15)]
+    return [(MARGIN, inner)]
+
+
+def _wrap(lines, width_pt):
+    chars = max(20, int(width_pt / (FONT_SIZE * 0.5)))
+    out = []
+    for line in lines:
+        out.extend(textwrap.wrap(line, chars) or [""])
+    return out
+
+
+def render_pdf(layout, header, skill_lines, body):
+    doc = fitz.open()
+    cols = _columns(layout)
+    per_col = int((PAGE_H - 2 * MARGIN) / LINE_H)
+    if layout == "sidebar":
+        # Contact details and skills in the narrow column, the rest on the right
+        streams = [_wrap(header + skill_lines, cols[0][1]), _wrap(body, cols[1][1])]
+    else:
+        streams = [_wrap(header + skill_lines + body, cols[0][1])]
+
+    def new_page():
+        return doc.new_page(width=PAGE_W, height=PAGE_H)
+
+    if len(streams) == 1:
+        lines = streams[0]
+        chunk = per_col * len(cols)
+        for start in range(0, len(lines), chunk):
+            page = new_page()
+            for i, (x, _w) in enumerate(cols):
+                part = lines[start + i * per_col: start + (i + 1) * per_col]
+                if part:
+                    page.insert_text((x, MARGIN + FONT_SIZE), part, fontsize=FONT_SIZE)
+    else:
+        side, main = streams
+        n_pages = max(1, -(-len(main) // per_col), -(-len(side) // per_col))
+        for p in range(n_pages):
+            page = new_page()
+            for (x, _w), lines in zip(cols, (side, main)):
+                part = lines[p * per_col: (p + 1) * per_col]
+                if part:
+                    page.insert_text((x, MARGIN + FONT_SIZE), part, fontsize=FONT_SIZE)
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def generate_resume(rng, pages=None, layout=None, skill_density=None):
+    pages = pages or rng.choice([1, 1, 2, 2, 3, 5, 10, 25, 50])
+    layout = layout or rng.choice(LAYOUTS)
+    skill_density = rng.uniform(0.05, 0.9) if skill_density is None else skill_density
+    header, skill_lines, body = resume_sections(rng, pages, skill_density)
+    meta = {"layout": layout, "pages": pages, "skill_density": round(skill_density, 3),
+            "name": header[0]}
+    return meta, render_pdf(layout, header, skill_lines, body)
+
+
+def generate_corpus(count, seed=0, **kwargs):
+    rng = random.Random(seed)
+    return [generate_resume(rng, **kwargs) for _ in range(count)]
+
+
+def generate_jd(seed=0, n_skills=8):
+    rng = random.Random(seed)
+    wanted = rng.sample(SKILLS, k=n_skills)
+    return (f"We are hiring a {rng.choice(TITLES)} to join {rng.choice(COMPANIES)}. "
+            f"Required skills: {', '.join(wanted)}. Experience with production systems, "
+            "strong communication and a relevant degree are expected.")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write a synthetic resume corpus to disk.")
+    ap.add_argument("out_dir")
+    ap.add_argument("--count", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pages", type=int, help="fixed page count (default: varied 1-50)")
+    ap.add_argument("--layout", choices=LAYOUTS)
+    ap.add_argument("--skill-density", type=float)
+    args = ap.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    corpus = generate_corpus(args.count, seed=args.seed, pages=args.pages, layout=args.layout,
+                             skill_density=args.skill_density)
+    for i, (meta, data) in enumerate(corpus):
+        path = os.path.join(args.out_dir, f"resume_{i:05d}_{meta['layout']}_{meta['pages']}p.pdf")
+        with open(path, "wb") as fh:
+            fh.write(data)
+    print(f"Wrote {len(corpus)} resumes to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# test_document.py
+# Shared AnalyzedDocument vs. handing each extractor the raw string.
+#
+# Besides time, each benchmark records in extra_info:
+#   text_passes  - full-text derived views built (lower/upper/lines/tokens...)
+#   peak_alloc_kb - tracemalloc peak while analyzing the corpus once
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("PyPDF2")
+pytest.importorskip("pytest_benchmark")
+
+import document  # noqa: E402
+from analyzer import (  # noqa: E402
+    ats_score_breakdown, extract_email, extract_name, extract_phone, extract_skills,
+    extract_text_from_pdf_bytes, extract_work_history,
+)
+from contacts import normalize_contacts  # noqa: E402
+from document import AnalyzedDocument  # noqa: E402
+
+
+def _analyze(text, jd_text):
+    skills = extract_skills(text)
+    work = extract_work_history(text)
+    return (extract_name(text), extract_email(text), extract_phone(text), normalize_contacts(text),
+            ats_score_breakdown(skills, text, jd_text, experience_years=work["total_years"]))
+
+
+def _raw_strings(texts, jd_text):
+    return [_analyze(t, jd_text) for t in texts]
+
+
+def _shared_document(texts, jd_text):
+    return [_analyze(AnalyzedDocument(t), jd_text) for t in texts]
+
+
+@pytest.fixture
+def doc_counter(monkeypatch):
+    # Records every AnalyzedDocument so the views it materialized can be counted
+    created = []
+    original = document.AnalyzedDocument.__init__
+
+    def init(self, text):
+        original(self, text)
+        created.append(self)
+
+    monkeypatch.setattr(document.AnalyzedDocument, "__init__", init)
+    return created
+
+
+def _measure(benchmark, run, texts, jd_text, created):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    run(texts, jd_text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    benchmark.extra_info["docs"] = len(texts)
+    benchmark.extra_info["peak_alloc_kb"] = round(peak / 1024, 1)
+    benchmark.extra_info["text_passes"] = sum(len(d.__dict__) - 1 for d in created)
+    return benchmark.extra_info["text_passes"]
+
+
+@pytest.mark.parametrize("mode", ["raw_strings", "shared_document"])
+def test_extractors(benchmark, corpus, jd_text, doc_counter, mode):
+    texts = [extract_text_from_pdf_bytes(data) for _m, data, _p in corpus]
+    run = _raw_strings if mode == "raw_strings" else _shared_document
+    passes = _measure(benchmark, run, texts, jd_text, doc_counter)
+    benchmark(run, texts, jd_text)
+    if mode == "shared_document":
+        # Each view (lower, upper, lines, ...) is built at most once per resume
+        assert passes <= 5 * len(texts)
@@ -0,0 +1,69 @@
+# test_pipeline.py
+# Throughput benchmarks for the resume analysis stages.
+#
+#   python -m pytest benchmarks --benchmark-autosave --benchmark-compare
+#
+# --benchmark-autosave stores each run under .benchmarks/ tagged with the
+# current commit; --benchmark-compare diffs against the previous saved run.
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("PyPDF2")
+pytest.importorskip("pytest_benchmark")
+
+import resume_parser  # noqa: E402
+from analyzer import (  # noqa: E402
+    analyze_resume, calculate_ats_score, extract_skills, extract_text_from_pdf_bytes,
+    extract_work_history,
+)
+
+
+def _texts(corpus):
+    return [extract_text_from_pdf_bytes(data) for _meta, data, _path in corpus]
+
+
+def _tag(benchmark, corpus):
+    benchmark.extra_info["docs"] = len(corpus)
+    benchmark.extra_info["pages"] = sum(meta["pages"] for meta, _data, _path in corpus)
+
+
+# ---------- STAGES ----------
+def test_extract_text_from_pdf_bytes(benchmark, corpus):
+    _tag(benchmark, corpus)
+    benchmark(lambda: [extract_text_from_pdf_bytes(data) for _m, data, _p in corpus])
+
+
+def test_parse_resume(benchmark, corpus):
+    _tag(benchmark, corpus)
+    benchmark(lambda: [resume_parser.parse_resume(path) for _m, _d, path in corpus])
+
+
+def test_extract_skills(benchmark, corpus):
+    texts = _texts(corpus)
+    _tag(benchmark, corpus)
+    benchmark(lambda: [extract_skills(t) for t in texts])
+
+
+def test_extract_work_history(benchmark, corpus):
+    texts = _texts(corpus)
+    _tag(benchmark, corpus)
+    benchmark(lambda: [extract_work_history(t) for t in texts])
+
+
+def test_calculate_ats_score(benchmark, corpus, jd_text):
+    texts = _texts(corpus)
+    skills = [extract_skills(t) for t in texts]
+    _tag(benchmark, corpus)
+    benchmark(lambda: [calculate_ats_score(s, t, jd_text) for s, t in zip(skills, texts)])
+
+
+# ---------- END TO END ----------
+def test_end_to_end(benchmark, corpus, jd_text):
+    _tag(benchmark, corpus)
+    results = benchmark(lambda: [analyze_resume(data, jd_text) for _m, data, _p in corpus])
+    assert len(results) == len(corpus)
+
+
+def test_score_resume_end_to_end(benchmark, corpus, jd_text):
+    _tag(benchmark, corpus)
+    benchmark(lambda: [resume_parser.score_resume(path, jd_text) for _m, _d, path in corpus])
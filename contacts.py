@@ -0,0 +1,226 @@
+# contacts.py
+# Contact normalization and dedup-aware export.
+#
+# normalize_contacts() finds every email and phone number in a resume:
+# emails are lowercased, phones rewritten to E.164 ("+919876543210") using a
+# default region for numbers written without a country code.
+#
+# export_grouped() streams records into sorted runs on disk and merges them, so
+# records sharing a normalized identity (first email, else first phone) come
+# out as one row while only the current group is held in memory.
+#
+#   python contacts.py --db resume_queue.sqlite3 --corpus store/ --region IN -o candidates.csv
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from document import as_document
+
+DEFAULT_REGION_ENV = "RESUME_DEFAULT_REGION"
+DEFAULT_REGION = "IN"
+
+# region -> (country calling code, national significant number length)
+REGIONS = {
+    "IN": ("91", 10), "US": ("1", 10), "CA": ("1", 10), "GB": ("44", 10),
+    "AU": ("61", 9), "DE": ("49", 11), "FR": ("33", 9), "SG": ("65", 8),
+    "AE": ("971", 9), "PK": ("92", 10), "BD": ("880", 10), "NG": ("234", 10),
+}
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+_PHONE_RE = re.compile(r"(?<!\w)(?:\+|00|\()?\d[\d\s().-]{6,18}\d(?!\d)")
+_YEAR_RANGE_RE = re.compile(r"(?:19|20)\d{2}\s*[-.]?\s*(?:19|20)\d{2}")
+
+
+# ---------- NORMALIZATION ----------
+def normalize_email(raw):
+    email = raw.strip().strip(".").lower()
+    return email if _EMAIL_RE.fullmatch(email) else None
+
+
+def normalize_phone(raw, default_region=None):
+    region = (default_region or os.environ.get(DEFAULT_REGION_ENV, DEFAULT_REGION)).upper()
+    cc, national_len = REGIONS.get(region, REGIONS[DEFAULT_REGION])
+    raw = raw.strip().lstrip("(")
+    digits = re.sub(r"\D", "", raw)
+    if raw.startswith("+"):
+        number = digits
+    elif raw.startswith("00"):
+        number = digits[2:]
+    else:
+        national = digits.lstrip("0")  # trunk prefix, e.g. 098765 43210
+        if len(national) == national_len:
+            number = cc + national
+        elif len(national) == len(cc) + national_len and national.startswith(cc):
+            number = national  # country code written without "+"
+        else:
+            return None
+    # E.164 allows at most 15 digits; shorter than 8 is not a phone number
+    return "+" + number if 8 <= len(number) <= 15 else None
+
+
+def _phone_from_match(raw, default_region):
+    # The pattern can run into a following number ("080 2345 6789 2016"), so
+    # fall back to the longest prefix of whitespace-separated groups that fits
+    groups = raw.split()
+    for n in range(len(groups), 0, -1):
+        phone = normalize_phone(" ".join(groups[:n]), default_region)
+        if phone:
+            return phone
+    return None
+
+
+def normalize_contacts(text, default_region=None):
+    emails, phones = [], []
+    text = as_document(text).text
+    if text:
+        for m in _EMAIL_RE.finditer(text):
+            email = normalize_email(m.group(0))
+            if email and email not in emails:
+                emails.append(email)
+        for m in _PHONE_RE.finditer(text):
+            if _YEAR_RANGE_RE.fullmatch(m.group(0).strip()):
+                continue  # "2016 - 2018" in a work history, not a phone number
+            phone = _phone_from_match(m.group(0), default_region)
+            if phone and phone not in phones:
+                phones.append(phone)
+    return {"emails": emails, "phones": phones}
+
+
+def _contacts_from_lists(rec, default_region=None):
+    # "emails"/"phones" as stored by analyze_resume()/score_resume()
+    emails, phones = [], []
+    for raw in rec.get("emails") or []:
+        email = normalize_email(raw)
+        if email and email not in emails:
+            emails.append(email)
+    for raw in rec.get("phones") or []:
+        phone = normalize_phone(raw, default_region)
+        if phone and phone not in phones:
+            phones.append(phone)
+    return {"emails": emails, "phones": phones}
+
+
+def identity_key(contacts):
+    if contacts["emails"]:
+        return "email:" + contacts["emails"][0]
+    if contacts["phones"]:
+        return "phone:" + contacts["phones"][0]
+    return None
+
+
+# ---------- STREAMING EXPORT ----------
+EXPORT_FIELDS = ["identity", "name", "emails", "phones", "resume_count", "best_ats_score", "best_source"]
+
+
+def _spill(chunk, tmp_dir):
+    chunk.sort(key=lambda line: line.split("\t", 1)[0])
+    fd, path = tempfile.mkstemp(dir=tmp_dir, suffix=".run")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.writelines(chunk)
+    return path
+
+
+def _read_run(path):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            key, payload = line.rstrip("\n").split("\t", 1)
+            yield key, payload
+
+
+def export_grouped(records, out_fh, default_region=None, chunk_size=50_000):
+    # records: iterable of dicts with "source" and, in order of preference,
+    # "text", the "emails"/"phones" lists of a scored result, or the legacy
+    # first-hit "email"/"mobile_number" fields; plus optional "name" and "ats_score".
+    # Memory: one chunk of chunk_size lines while sorting, then one group at a time.
+    writer = csv.DictWriter(out_fh, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    groups = 0
+    with tempfile.TemporaryDirectory(prefix="contacts_export_") as tmp_dir:
+        runs, chunk = [], []
+        for i, rec in enumerate(records):
+            if rec.get("text"):
+                contacts = normalize_contacts(rec["text"], default_region)
+            elif rec.get("emails") or rec.get("phones"):
+                contacts = _contacts_from_lists(rec, default_region)
+            else:
+                raw = " ; ".join(str(rec.get(k) or "") for k in ("email", "mobile_number", "phone"))
+                contacts = normalize_contacts(raw, default_region)
+            key = identity_key(contacts) or f"source:{rec.get('source', i)}"
+            payload = {"name": rec.get("name"), "ats_score": rec.get("ats_score"),
+                       "source": rec.get("source"), **contacts}
+            chunk.append(key + "\t" + json.dumps(payload) + "\n")
+            if len(chunk) >= chunk_size:
+                runs.append(_spill(chunk, tmp_dir))
+                chunk = []
+        if chunk:
+            runs.append(_spill(chunk, tmp_dir))
+
+        merged = heapq.merge(*(_read_run(p) for p in runs), key=lambda kv: kv[0])
+        for key, items in itertools.groupby(merged, key=lambda kv: kv[0]):
+            row = {"identity": key, "name": None, "emails": [], "phones": [],
+                   "resume_count": 0, "best_ats_score": None, "best_source": None}
+            for _, payload in items:
+                p = json.loads(payload)
+                row["resume_count"] += 1
+                if not row["name"] and p["name"] and p["name"] not in ("Not found", "Not Found"):
+                    row["name"] = p["name"]
+                row["emails"] += [e for e in p["emails"] if e not in row["emails"]]
+                row["phones"] += [t for t in p["phones"] if t not in row["phones"]]
+                score = p["ats_score"]
+                if score is not None and (row["best_ats_score"] is None or score > row["best_ats_score"]):
+                    row["best_ats_score"], row["best_source"] = score, p["source"]
+            row["emails"] = ";".join(row["emails"])
+            row["phones"] = ";".join(row["phones"])
+            writer.writerow(row)
+            groups += 1
+    return groups
+
+
+def records_from_queue(db_path, corpus_dir=None):
+    # Completed jobs from watch_daemon's SQLite queue, streamed row by row;
+    # with a corpus_store directory the full text is used to find every contact
+    store = None
+    if corpus_dir:
+        from corpus_store import CorpusStore
+        store = CorpusStore(corpus_dir)
+    conn = sqlite3.connect(db_path)
+    try:
+        for path, sha256, result in conn.execute(
+                "SELECT path, sha256, result FROM jobs WHERE status = 'done'"):
+            rec = json.loads(result)
+            rec["source"] = path
+            if store is not None and sha256 in store:
+                rec["text"] = store.get_text(sha256)
+            yield rec
+    finally:
+        conn.close()
+        if store is not None:
+            store.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export scored candidates grouped by normalized contact.")
+    ap.add_argument("--db", default="resume_queue.sqlite3", help="watch_daemon queue database")
+    ap.add_argument("--corpus", help="corpus_store directory with the extracted texts")
+    ap.add_argument("--region", help=f"default region for local phone numbers (default {DEFAULT_REGION})")
+    ap.add_argument("-o", "--output", help="CSV file (default: stdout)")
+    args = ap.parse_args()
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        groups = export_grouped(records_from_queue(args.db, args.corpus), out, default_region=args.region)
+    finally:
+        if args.output:
+            out.close()
+    print(f"Exported {groups} candidates", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
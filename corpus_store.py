@@ -0,0 +1,203 @@
+# corpus_store.py
+# Append-only on-disk store for extracted resume text, so re-scoring campaigns
+# read text instead of re-parsing PDFs.
+#
+#   <dir>/corpus.bin   UTF-8 texts, back to back
+#   <dir>/corpus.idx   fixed 48-byte records: sha256 of the PDF, offset, length
+#
+# Data is written before its index record, so a crash can at worst leave
+# unreferenced bytes at the end of corpus.bin, or a partial index record that
+# readers skip and the next append() truncates. Readers memory-map both files
+# and get zero-copy memoryview slices per document. A slice stays valid for as
+# long as it is held: when the store remaps the grown file, the old mapping is
+# only unmapped once its last slice is released.
+#
+#   python corpus_store.py ingest  store/ archive/*.pdf
+#   python corpus_store.py rescore store/ --jd job.txt [--policies ab.json]
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+
+_RECORD = struct.Struct("<32sQQ")
+
+
+class CorpusStore:
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._data_path = os.path.join(path, "corpus.bin")
+        self._index_path = os.path.join(path, "corpus.idx")
+        for p in (self._data_path, self._index_path):
+            if not os.path.exists(p):
+                open(p, "wb").close()
+        self._entries = {}   # digest -> (offset, length)
+        self._order = []     # digests in insertion order
+        self._data_map = None
+        self._index_size = 0
+        self.refresh()
+
+    # ---------- READING ----------
+    def refresh(self):
+        # Picks up records appended since the last call (by this or another process)
+        size = os.path.getsize(self._index_path)
+        size -= size % _RECORD.size  # ignore a half-written trailing record
+        if size > self._index_size:
+            with open(self._index_path, "rb") as fh, \
+                    mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ) as idx:
+                for pos in range(self._index_size, size, _RECORD.size):
+                    digest, offset, length = _RECORD.unpack_from(idx, pos)
+                    if digest not in self._entries:
+                        self._order.append(digest)
+                    self._entries[digest] = (offset, length)
+            self._index_size = size
+        self._remap()
+
+    def _release_map(self):
+        if self._data_map is not None:
+            try:
+                self._data_map.close()
+            except BufferError:
+                pass  # get_bytes() views are alive; the map is freed with the last of them
+            self._data_map = None
+
+    def _remap(self):
+        size = os.path.getsize(self._data_path)
+        if self._data_map is not None and len(self._data_map) == size:
+            return
+        self._release_map()
+        if size:
+            with open(self._data_path, "rb") as fh:
+                self._data_map = mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, key):
+        return _digest(key) in self._entries
+
+    def get_bytes(self, key):
+        # Zero-copy view into the mapped file (see the module comment on lifetime)
+        offset, length = self._entries[_digest(key)]
+        if length == 0:
+            return memoryview(b"")  # e.g. a scanned PDF with no text layer
+        if self._data_map is None or offset + length > len(self._data_map):
+            self._remap()  # appended after the last mapping, possibly by this process
+        return memoryview(self._data_map)[offset:offset + length]
+
+    def get_text(self, key):
+        return str(self.get_bytes(key), "utf-8")
+
+    def iter_texts(self):
+        for digest in self._order:
+            yield digest.hex(), self.get_text(digest)
+
+    # ---------- WRITING ----------
+    def append(self, key, text):
+        # Idempotent per key; one writer at a time
+        digest = _digest(key)
+        if digest in self._entries:
+            return False
+        data = text.encode("utf-8")
+        with open(self._data_path, "ab") as fh:
+            offset = fh.tell()
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        with open(self._index_path, "r+b") as fh:
+            # Drop a record torn by an earlier crash; appending after it would
+            # misalign every later record
+            end = fh.seek(0, os.SEEK_END)
+            if end % _RECORD.size:
+                end -= end % _RECORD.size
+                fh.truncate(end)
+                fh.seek(end)
+            fh.write(_RECORD.pack(digest, offset, len(data)))
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._entries[digest] = (offset, len(data))
+        self._order.append(digest)
+        self._index_size += _RECORD.size
+        return True
+
+    def close(self):
+        self._release_map()
+
+
+def _digest(key):
+    # Keys are sha256 digests, as raw bytes or hex (watch_daemon stores hex)
+    return bytes.fromhex(key) if isinstance(key, str) else bytes(key)
+
+
+def pdf_sha256(file_path):
+    h = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cached_text(store, file_path, extract=None):
+    # Extracted text for a PDF, parsing it only the first time it is seen
+    key = pdf_sha256(file_path)
+    if key in store:
+        return store.get_text(key)
+    if extract is None:
+        from resume_parser import extract_text_from_pdf as extract
+    text = extract(file_path)
+    store.append(key, text)
+    return text
+
+
+# ---------- RE-SCORING ----------
+def rescore(store, jd_text="", policies=None):
+    # Yields (key, [breakdown per policy]) for every stored text without touching a PDF
+    from analyzer import extract_skills, extract_work_history
+    from document import AnalyzedDocument
+    from scoring import compile_policy, score_batch
+
+    policies = policies or [compile_policy()]
+    for key, text in store.iter_texts():
+        doc = AnalyzedDocument(text)
+        record = {"text": doc, "skills": extract_skills(doc),
+                  "experience_years": extract_work_history(doc)["total_years"]}
+        yield key, score_batch([record], policies, jd_text)[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Append-only store of extracted resume text.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    i = sub.add_parser("ingest", help="extract and store text for PDFs not stored yet")
+    i.add_argument("store")
+    i.add_argument("pdfs", nargs="+")
+    r = sub.add_parser("rescore", help="score every stored text, CSV on stdout")
+    r.add_argument("store")
+    r.add_argument("--jd", help="text file with the job description")
+    r.add_argument("--policies", help="JSON scoring policy file (see scoring.py)")
+    args = ap.parse_args()
+
+    store = CorpusStore(args.store)
+    if args.cmd == "ingest":
+        before = len(store)
+        for path in args.pdfs:
+            cached_text(store, path)
+        print(f"Stored {len(store) - before} new texts; corpus holds {len(store)}")
+        return
+
+    from scoring import load_policies
+    jd_text = ""
+    if args.jd:
+        with open(args.jd, encoding="utf-8") as fh:
+            jd_text = fh.read()
+    policies = load_policies(args.policies) if args.policies else None
+    header = False
+    for key, breakdowns in rescore(store, jd_text, policies):
+        if not header:
+            print("sha256," + ",".join(b["policy"] for b in breakdowns))
+            header = True
+        print(key + "," + ",".join(str(b["total"]) for b in breakdowns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+# distributed.py
+# Distributed batch scoring. A coordinator splits a resume list into one task
+# per PDF on a broker; workers lease tasks in batches, score them with
+# resume_parser.score_resume and write results back. Tasks carry a shard
+# number (--shard-size consecutive PDFs) that only sets the order in which
+# they are leased, so a job's early shards finish first; workers do not own
+# shards and a batch may span two of them.
+#
+#   python distributed.py --broker sqlite://broker.db submit --jd job.txt archive/*.pdf
+#   python distributed.py --broker sqlite://broker.db worker --processes 4
+#   python distributed.py --broker sqlite://broker.db status <job>
+#   python distributed.py --broker sqlite://broker.db results <job> > results.jsonl
+#
+# Task ids are "<job>:<sha256 of the PDF>", so resubmitting a list, duplicate
+# PDFs, or a retry after an expired lease never produce a second result.
+# Workers need the PDF paths to be readable on their node (shared storage).
+#
+# The bundled SQLite broker is for workers on ONE host: it uses WAL, which
+# needs shared memory between the processes and does not work over NFS/SMB,
+# where leases could be double-issued. Spreading workers over several nodes
+# needs a networked Broker implementation (Redis, SQS, a database server...).
+import abc
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+
+from corpus_store import pdf_sha256
+
+
+# ---------- BROKER INTERFACE ----------
+class Broker(abc.ABC):
+    # Implement these to plug in another transport (Redis, SQS, ...); a broker
+    # missing any of them fails when it is created, not in the middle of a job
+    @abc.abstractmethod
+    def create_job(self, job_id, jd_text):
+        ...
+
+    @abc.abstractmethod
+    def submit(self, job_id, tasks):
+        # tasks: iterable of (task_id, shard, path); returns how many were new.
+        # lease() hands out lower shards first.
+        ...
+
+    @abc.abstractmethod
+    def lease(self, worker_id, limit, lease_seconds):
+        # -> [(task_id, job_id, path, jd_text)] reserved for this worker
+        ...
+
+    @abc.abstractmethod
+    def complete(self, task_id, worker_id, result):
+        # True if this call recorded the result (first completion wins)
+        ...
+
+    @abc.abstractmethod
+    def fail(self, task_id, worker_id, error):
+        ...
+
+    @abc.abstractmethod
+    def progress(self, job_id):
+        ...
+
+    @abc.abstractmethod
+    def results(self, job_id):
+        ...
+
+
+class SQLiteBroker(Broker):
+    # Single-file broker for workers on one host (see the module comment on
+    # network filesystems). Leases expire, so tasks held by a crashed worker
+    # are handed out again.
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id     TEXT PRIMARY KEY,
+        jd_text    TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS tasks (
+        task_id     TEXT PRIMARY KEY,
+        job_id      TEXT NOT NULL,
+        shard       INTEGER NOT NULL,
+        path        TEXT NOT NULL,
+        status      TEXT NOT NULL DEFAULT 'pending',
+        attempts    INTEGER NOT NULL DEFAULT 0,
+        worker      TEXT,
+        lease_until REAL NOT NULL DEFAULT 0,
+        result      TEXT,
+        error       TEXT
+    );
+    CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, shard, lease_until);
+    CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job_id, status);
+    """
+
+    def __init__(self, db_path, max_attempts=3):
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(db_path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def create_job(self, job_id, jd_text):
+        self.conn.execute("INSERT OR IGNORE INTO jobs VALUES (?, ?, ?)", (job_id, jd_text, time.time()))
+        self.conn.commit()
+
+    def submit(self, job_id, tasks):
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO tasks (task_id, job_id, shard, path) VALUES (?, ?, ?, ?)",
+            ((task_id, job_id, shard, path) for task_id, shard, path in tasks),
+        )
+        self.conn.commit()
+        return self.conn.total_changes - before
+
+    def lease(self, worker_id, limit, lease_seconds):
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A task whose worker keeps dying (e.g. a PDF that crashes the parser) gives up
+            self.conn.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired too many times' "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            rows = self.conn.execute(
+                "SELECT t.task_id, t.job_id, t.path, j.jd_text FROM tasks t JOIN jobs j USING (job_id) "
+                "WHERE t.status = 'pending' OR (t.status = 'leased' AND t.lease_until < ?) "
+                "ORDER BY t.shard LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE task_id = ?",
+                ((worker_id, now + lease_seconds, r[0]) for r in rows),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def complete(self, task_id, worker_id, result):
+        # First completion wins; a late duplicate from an expired lease is ignored
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'done', result = ?, worker = ?, error = NULL "
+            "WHERE task_id = ? AND status != 'done'",
+            (json.dumps(result), worker_id, task_id),
+        )
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    def fail(self, task_id, worker_id, error):
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = 0 WHERE task_id = ? AND status = 'leased' AND worker = ?",
+            (self.max_attempts, error, task_id, worker_id),
+        )
+        self.conn.commit()
+
+    def progress(self, job_id):
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,))))
+        return counts
+
+    def results(self, job_id):
+        for task_id, path, result in self.conn.execute(
+                "SELECT task_id, path, result FROM tasks WHERE job_id = ? AND status = 'done' ORDER BY shard",
+                (job_id,)):
+            yield task_id, path, json.loads(result)
+
+
+BROKERS = {"sqlite": SQLiteBroker}
+
+
+def make_broker(url):
+    # "sqlite:///shared/broker.db" -> SQLiteBroker("/shared/broker.db"),
+    # "sqlite://broker.db" -> a path relative to the working directory
+    scheme, sep, rest = url.partition("://")
+    if not sep or scheme not in BROKERS:
+        raise ValueError(f"Unsupported broker URL '{url}' (known schemes: {', '.join(BROKERS)})")
+    return BROKERS[scheme](rest)
+
+
+# ---------- COORDINATOR ----------
+def default_job_id(jd_text):
+    return hashlib.sha256(jd_text.encode("utf-8")).hexdigest()[:12]
+
+
+def submit_job(broker, pdf_paths, jd_text="", job_id=None, shard_size=100):
+    job_id = job_id or default_job_id(jd_text)
+    broker.create_job(job_id, jd_text)
+    tasks = []
+    for i, path in enumerate(pdf_paths):
+        path = os.path.abspath(path)
+        tasks.append((f"{job_id}:{pdf_sha256(path)}", i // shard_size, path))
+    return job_id, broker.submit(job_id, tasks)
+
+
+# ---------- WORKER ----------
+def run_worker(broker, worker_id=None, batch=10, lease_seconds=300, idle_exit=30.0, poll=2.0):
+    from resume_parser import score_resume
+
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    idle_since = time.time()
+    done = 0
+    while True:
+        tasks = broker.lease(worker_id, batch, lease_seconds)
+        if not tasks:
+            if idle_exit is not None and time.time() - idle_since > idle_exit:
+                break
+            time.sleep(poll)
+            continue
+        idle_since = time.time()
+        for task_id, _job_id, path, jd_text in tasks:
+            try:
+                result = score_resume(path, jd_text)
+                if result is None:
+                    raise RuntimeError("parse_resume returned no data")
+            except Exception as e:
+                broker.fail(task_id, worker_id, f"{type(e).__name__}: {e}")
+                continue
+            result.pop("text", None)
+            if broker.complete(task_id, worker_id, result):
+                done += 1
+    print(f"Worker {worker_id} finished {done} tasks")
+    return done
+
+
+def _worker_process(broker_url, batch, lease_seconds, idle_exit):
+    run_worker(make_broker(broker_url), batch=batch, lease_seconds=lease_seconds, idle_exit=idle_exit)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Distributed batch resume scoring.")
+    ap.add_argument("--broker", default="sqlite://broker.db",
+                    help="broker URL, e.g. sqlite:///var/lib/resumes/broker.db (local disk only)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("submit", help="shard PDFs into tasks for a job")
+    s.add_argument("pdfs", nargs="+")
+    s.add_argument("--jd", help="text file with the job description")
+    s.add_argument("--job", help="job id (default: derived from the JD)")
+    s.add_argument("--shard-size", type=int, default=100,
+                   help="PDFs per shard; shards only set the lease order")
+    w = sub.add_parser("worker", help="lease and score tasks until the broker is idle")
+    w.add_argument("--processes", type=int, default=1)
+    w.add_argument("--batch", type=int, default=10)
+    w.add_argument("--lease-seconds", type=float, default=300)
+    w.add_argument("--idle-exit", type=float, default=30.0, help="exit after this many idle seconds")
+    p = sub.add_parser("status")
+    p.add_argument("job")
+    r = sub.add_parser("results", help="JSON lines, one per completed task")
+    r.add_argument("job")
+    args = ap.parse_args()
+
+    if args.cmd == "worker":
+        procs = [multiprocessing.Process(target=_worker_process,
+                                         args=(args.broker, args.batch, args.lease_seconds, args.idle_exit))
+                 for _ in range(args.processes)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return
+
+    broker = make_broker(args.broker)
+    if args.cmd == "submit":
+        jd_text = ""
+        if args.jd:
+            with open(args.jd, encoding="utf-8") as fh:
+                jd_text = fh.read()
+        job_id, added = submit_job(broker, args.pdfs, jd_text, args.job, args.shard_size)
+        print(f"Job {job_id}: {added} new tasks ({len(args.pdfs) - added} already known)")
+    elif args.cmd == "status":
+        print(json.dumps(broker.progress(args.job)))
+    else:
+        for task_id, path, result in broker.results(args.job):
+            print(json.dumps({"task_id": task_id, "path": path, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# document.py
+# One analyzed view of a resume's text, shared by every extractor and scorer so
+# the text is lowercased, uppercased, split into lines and tokenized at most
+# once per analysis instead of once per extractor call.
+#
+# Each view is computed on first use and cached, so wrapping a string costs
+# nothing until a view is needed. Extractors accept either a plain string or an
+# AnalyzedDocument (see as_document).
+import re
+from functools import cached_property
+from typing import Union
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.]*")
+
+
+class AnalyzedDocument:
+    def __init__(self, text):
+        self.text = text or ""
+
+    def __bool__(self):
+        return bool(self.text)
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def upper(self):
+        return self.text.upper()
+
+    @cached_property
+    def lines(self):
+        # Stripped, non-empty lines in order
+        return [ln for ln in (raw.strip() for raw in self.text.splitlines()) if ln]
+
+    @cached_property
+    def lower_lines(self):
+        return [ln for ln in (raw.strip() for raw in self.lower.splitlines()) if ln]
+
+    @cached_property
+    def tokens(self):
+        # (start, end) offsets into .text; slice .text/.lower/.upper as needed
+        return [m.span() for m in _TOKEN_RE.finditer(self.text)]
+
+    @cached_property
+    def lower_tokens(self):
+        lower = self.lower
+        if len(lower) != len(self.text):  # rare Unicode case changes shift offsets
+            return [m.group(0) for m in _TOKEN_RE.finditer(lower)]
+        return [lower[s:e] for s, e in self.tokens]
+
+
+Text = Union[str, AnalyzedDocument]
+
+
+def as_document(text: Text) -> AnalyzedDocument:
+    return text if isinstance(text, AnalyzedDocument) else AnalyzedDocument(text)
@@ -0,0 +1,107 @@
+# ner.py
+# Optional spaCy-based entity extraction (person names, organizations, locations).
+# Uses a locally installed model (default en_core_web_sm, see run_app.bat) that is
+# loaded once per process and reused by every call.
+#
+#   python ner.py resumes/*.pdf --processes 4      # bulk run, JSON lines on stdout
+#
+# Enable it in the app with RESUME_USE_NER=1. Without spaCy or the model the
+# regular heuristics in analyzer.py are used.
+import argparse
+import json
+import os
+
+MODEL_ENV = "RESUME_NER_MODEL"
+USE_NER_ENV = "RESUME_USE_NER"
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Only the entity recognizer (and the tok2vec layer it listens to) is needed
+_EXCLUDE = ["parser", "tagger", "lemmatizer", "attribute_ruler", "senter"]
+_LABELS = {"PERSON": "names", "ORG": "organizations", "GPE": "locations", "LOC": "locations"}
+# Candidate names must start within the resume header
+_HEADER_CHARS = 400
+
+_nlp = None
+_load_failed = False
+
+
+def ner_enabled():
+    return os.environ.get(USE_NER_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_nlp():
+    # One model per process; later calls (and pool workers after their first
+    # task) reuse it instead of paying the load cost again.
+    global _nlp, _load_failed
+    if _nlp is None and not _load_failed:
+        try:
+            import spacy  # imported lazily: it is slow and optional
+        except ImportError:
+            _load_failed = True
+            return None
+        try:
+            _nlp = spacy.load(os.environ.get(MODEL_ENV, DEFAULT_MODEL), exclude=_EXCLUDE)
+        except OSError as e:
+            print("NER model not available:", e)
+            _load_failed = True
+    return _nlp
+
+
+def ner_available():
+    return get_nlp() is not None
+
+
+def _entities_from_doc(doc):
+    found = {"name": None, "names": [], "organizations": [], "locations": []}
+    for ent in doc.ents:
+        key = _LABELS.get(ent.label_)
+        if key is None:
+            continue
+        value = " ".join(ent.text.split())
+        if value not in found[key]:
+            found[key].append(value)
+        if key == "names" and found["name"] is None and ent.start_char < _HEADER_CHARS:
+            found["name"] = value
+    return found
+
+
+def _clip(nlp, texts):
+    return (t[: nlp.max_length] if t else "" for t in texts)
+
+
+def extract_entities(text):
+    nlp = get_nlp()
+    if nlp is None or not text:
+        return None
+    return _entities_from_doc(nlp(next(_clip(nlp, [text]))))
+
+
+def extract_entities_batch(texts, n_process=1, batch_size=32):
+    # nlp.pipe streams the texts; with n_process > 1 spaCy starts worker
+    # processes that each load the model once for the whole batch.
+    nlp = get_nlp()
+    if nlp is None:
+        return [None] * len(texts)
+    return [_entities_from_doc(doc)
+            for doc in nlp.pipe(_clip(nlp, texts), n_process=n_process, batch_size=batch_size)]
+
+
+def main():
+    from resume_parser import extract_text_from_pdf
+
+    ap = argparse.ArgumentParser(description="Extract names, organizations and locations from resumes.")
+    ap.add_argument("pdfs", nargs="+")
+    ap.add_argument("--processes", type=int, default=1)
+    ap.add_argument("--batch-size", type=int, default=32)
+    args = ap.parse_args()
+
+    if not ner_available():
+        raise SystemExit(f"spaCy model not installed; run: python -m spacy download {DEFAULT_MODEL}")
+    texts = [extract_text_from_pdf(p) for p in args.pdfs]
+    results = extract_entities_batch(texts, n_process=args.processes, batch_size=args.batch_size)
+    for path, ents in zip(args.pdfs, results):
+        print(json.dumps({"file": path, **ents}))
+
+
+if __name__ == "__main__":
+    main()
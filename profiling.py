@@ -0,0 +1,170 @@
+# profiling.py
+# Opt-in per-upload profiling: wraps one analysis in cProfile + tracemalloc and
+# writes the results under RESUME_PROFILE_DIR/<sha256 of the PDF>/.
+#
+# Enable with RESUME_PROFILE=1 (or ?profile=1 in the app URL), then inspect with
+#   python profiling.py            # summary table of every profiled upload
+#   python profiling.py <sha256>   # top functions and allocation sites of one upload
+import cProfile
+import hashlib
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+PROFILE_ENV = "RESUME_PROFILE"
+PROFILE_DIR_ENV = "RESUME_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "profiles"
+
+# tracemalloc is process-global and Python 3.12+ allows one active cProfile at a
+# time, so concurrent sessions take turns instead of stopping each other's trace
+_PROFILE_LOCK = threading.Lock()
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def profile_dir():
+    return os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+
+
+def pdf_key(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+# ---------- CAPTURE ----------
+def _top_functions(profiler, limit):
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, lineno, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{lineno}({func})",
+            "calls": nc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6),
+        })
+    rows.sort(key=lambda r: r["cumtime"], reverse=True)
+    return rows[:limit]
+
+
+def _top_allocations(before, after, limit):
+    # Growth per site across the call, so blocks that were alive before it
+    # (module caches, earlier imports) do not crowd out what the call allocated
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    rows = []
+    for stat in sorted(diff, key=lambda s: s.size_diff, reverse=True)[:limit]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        rows.append({
+            "site": f"{frame.filename}:{frame.lineno}",
+            "size_kb": round(stat.size_diff / 1024, 1),
+            "count": stat.count_diff,
+        })
+    return rows
+
+
+def profile_call(file_bytes, func, *args, out_dir=None, top=25, **kwargs):
+    # Returns (func's result, summary dict); artifacts are written as a side effect
+    key = pdf_key(file_bytes)
+    target = os.path.join(out_dir or profile_dir(), key)
+    os.makedirs(target, exist_ok=True)
+
+    with _PROFILE_LOCK:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(10)
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            result = profiler.runcall(func, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current, peak = tracemalloc.get_traced_memory()  # before the snapshot allocates
+            after = tracemalloc.take_snapshot()
+            if not already_tracing:
+                tracemalloc.stop()
+
+    profiler.dump_stats(os.path.join(target, "profile.prof"))
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(top)
+    with open(os.path.join(target, "profile.txt"), "w", encoding="utf-8") as fh:
+        fh.write(report.getvalue())
+
+    summary = {
+        "sha256": key,
+        "profiled_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "pdf_bytes": len(file_bytes),
+        "wall_time_s": round(elapsed, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "top_functions": _top_functions(profiler, top),
+        "top_allocations": _top_allocations(before, after, top),
+    }
+    with open(os.path.join(target, "summary.json"), "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+    return result, summary
+
+
+# ---------- SUMMARY VIEW ----------
+def load_summaries(out_dir=None):
+    root = out_dir or profile_dir()
+    summaries = []
+    if not os.path.isdir(root):
+        return summaries
+    for key in os.listdir(root):
+        path = os.path.join(root, key, "summary.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as fh:
+                summaries.append(json.load(fh))
+    summaries.sort(key=lambda s: s["wall_time_s"], reverse=True)
+    return summaries
+
+
+def format_summary(summary, limit=10):
+    lines = [
+        f"PDF {summary['sha256']}  ({summary['pdf_bytes']} bytes, profiled {summary['profiled_at']})",
+        f"wall time {summary['wall_time_s']:.3f}s, peak traced memory {summary['peak_memory_kb']:.0f} KB",
+        "",
+        "Top functions (cumulative):",
+    ]
+    for row in summary["top_functions"][:limit]:
+        lines.append(f"  {row['cumtime']:>9.4f}s {row['calls']:>8} calls  {row['function']}")
+    lines += ["", "Top allocation sites (net growth during the call):"]
+    for row in summary["top_allocations"][:limit]:
+        lines.append(f"  {row['size_kb']:>9.1f} KB {row['count']:>8} blocks  {row['site']}")
+    return "\n".join(lines)
+
+
+def main():
+    summaries = load_summaries()
+    if len(sys.argv) > 1:
+        wanted = [s for s in summaries if s["sha256"].startswith(sys.argv[1])]
+        if not wanted:
+            print(f"No profile found for {sys.argv[1]} in {profile_dir()}")
+            return
+        print(format_summary(wanted[0], limit=25))
+        return
+    if not summaries:
+        print(f"No profiles in {profile_dir()}")
+        return
+    print(f"{'sha256':<16} {'wall s':>8} {'peak KB':>9} {'bytes':>10}  profiled at")
+    for s in summaries:
+        print(f"{s['sha256'][:16]} {s['wall_time_s']:>8.3f} {s['peak_memory_kb']:>9.0f} "
+              f"{s['pdf_bytes']:>10}  {s['profiled_at']}")
+
+
+if __name__ == "__main__":
+    main()
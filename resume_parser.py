@@ -1,5 +1,8 @@
 import re
 import fitz  # PyMuPDF for clean PDF reading
+from analyzer import calculate_ats_score, extract_work_history
+from contacts import normalize_contacts
+from document import AnalyzedDocument, as_document
 
 # ---------- PDF TEXT EXTRACTION ----------
 def extract_text_from_pdf(file_path):
@@ -11,18 +14,19 @@ def extract_text_from_pdf(file_path):
 
 
 # ---------- CLEAN EXTRACTIONS ----------
+# All extractors accept a str or a shared document.AnalyzedDocument
 def clean_name(text):
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    lines = as_document(text).lines
     if lines:
         return re.sub(r'[^\x00-\x7F]+', '', lines[0])  # remove weird chars
     return "Not Found"
 
 def extract_email(text):
-    match = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)
+    match = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", as_document(text).text)
     return match.group(0) if match else "Not Found"
 
 def extract_phone(text):
-    match = re.search(r"(\+?\d{1,3})?[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}", text)
+    match = re.search(r"(\+?\d{1,3})?[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}", as_document(text).text)
     return match.group(0) if match else "Not Found"
 
 
@@ -48,33 +52,33 @@ uiux_keywords = [
 all_keywords = ds_keywords + web_keywords + android_keywords + ios_keywords + uiux_keywords
 
 def extract_skills(text):
-    skills = []
-    for skill in all_keywords:
-        if skill.lower() in text.lower():
-            skills.append(skill)
+    lower = as_document(text).lower
+    skills = [skill for skill in all_keywords if skill in lower]  # keywords are lowercase
     return list(set(skills)) if skills else ["Not Found"]
 
 
 # ---------- EDUCATION & EXPERIENCE ----------
 def extract_education(text):
     education_keywords = ["b.sc", "m.sc", "b.tech", "m.tech", "mba", "bachelor", "master", "phd", "degree"]
-    for line in text.lower().split("\n"):
+    for line in as_document(text).lower_lines:
         for word in education_keywords:
             if word in line:
-                return line.strip()
+                return line
     return "Not Found"
 
 def extract_experience(text):
-    exp_match = re.findall(r"(\d+)\+?\s*(years|yrs|year)", text.lower())
+    exp_match = re.findall(r"(\d+)\+?\s*(years|yrs|year)", as_document(text).lower)
     if exp_match:
         return [f"{num} {unit}" for num, unit in exp_match]
     return ["Not Found"]
 
 
 # ---------- MAIN FUNCTION ----------
-def parse_resume(file_path):
+def parse_resume(file_path, text=None):
     try:
-        text = extract_text_from_pdf(file_path)
+        if text is None:
+            text = extract_text_from_pdf(file_path)
+        text = as_document(text)
 
         data = {
             "name": clean_name(text),
@@ -89,3 +93,22 @@ def parse_resume(file_path):
     except Exception as e:
         print("Error parsing resume:", e)
         return None
+
+
+# ---------- SCORING ----------
+def score_resume(file_path, jd_text=""):
+    # Reads the PDF once and reuses the text for both parsing and ATS scoring;
+    # the text is returned too so callers can keep it (see corpus_store.py)
+    text = extract_text_from_pdf(file_path)
+    doc = AnalyzedDocument(text)
+    data = parse_resume(file_path, text=doc)
+    if data is None:
+        return None
+    skills = [s for s in data["skills"] if s != "Not Found"]
+    data.update(normalize_contacts(doc))
+    work = extract_work_history(doc)
+    data["work_history"] = work["roles"]
+    data["experience_years"] = work["total_years"]
+    data["ats_score"] = calculate_ats_score(skills, doc, jd_text, experience_years=work["total_years"])
+    data["text"] = text
+    return data
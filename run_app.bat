@@ -4,5 +4,5 @@ call venv\Scripts\activate
 python -m pip install --upgrade pip
 python -m pip install -r requirements.txt
 python -m spacy download en_core_web_sm
-python -m streamlit run App.py
+python warmup.py --serve
 pause
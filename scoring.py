@@ -0,0 +1,174 @@
+# scoring.py
+# Rule-based ATS scoring. A policy (plain dict / JSON file) sets the weights,
+# compile_policy() turns it into a list of rule functions once, and every call
+# returns the per-component breakdown alongside the clamped total.
+#
+# DEFAULT_POLICY reproduces the original hardcoded calculate_ats_score.
+# Set ATS_SCORING_POLICY=/path/to/policy.json to change the app's weights.
+import copy
+import json
+import os
+
+from document import as_document
+
+DEFAULT_POLICY = {
+    "name": "default",
+    "base": 20,
+    "skills": {"per_jd_match": 8, "jd_cap": 50, "per_skill_no_jd": 5, "no_jd_cap": 40},
+    "sections": {"points": 5, "keywords": ["experience", "education", "project", "certification"]},
+    "missing_section_penalties": {"experience": -5, "education": -5},
+    "experience": {"per_year": 2, "cap": 10},
+    "coverage": {"weight": 30},
+    "clamp": [0, 100],
+}
+
+POLICY_ENV = "ATS_SCORING_POLICY"
+
+# policy key -> builder(config) returning rule(ctx) -> points
+RULES = {}
+
+
+def register_rule(key):
+    def wrap(builder):
+        RULES[key] = builder
+        return builder
+    return wrap
+
+
+# ---------- RULES ----------
+@register_rule("base")
+def _base_rule(points):
+    return lambda ctx: points
+
+
+@register_rule("skills")
+def _skills_rule(cfg):
+    def rule(ctx):
+        if ctx["jd_text"]:
+            return min(len(ctx["matched_skills"]) * cfg["per_jd_match"], cfg["jd_cap"])
+        return min(len(ctx["skills"]) * cfg["per_skill_no_jd"], cfg["no_jd_cap"])
+    return rule
+
+
+@register_rule("sections")
+def _sections_rule(cfg):
+    keywords = tuple(kw.lower() for kw in cfg["keywords"])
+    points = cfg["points"]
+    return lambda ctx: sum(points for kw in keywords if kw in ctx["text_lower"])
+
+
+@register_rule("missing_section_penalties")
+def _penalty_rule(cfg):
+    penalties = tuple((kw.lower(), pts) for kw, pts in cfg.items())
+    return lambda ctx: sum(pts for kw, pts in penalties if kw not in ctx["text_lower"])
+
+
+@register_rule("experience")
+def _experience_rule(cfg):
+    def rule(ctx):
+        years = ctx["experience_years"]
+        return min(int(years) * cfg["per_year"], cfg["cap"]) if years else 0
+    return rule
+
+
+@register_rule("coverage")
+def _coverage_rule(cfg):
+    def rule(ctx):
+        if not (ctx["jd_text"] and ctx["skills"]):
+            return 0
+        return int((len(ctx["matched_skills"]) / max(1, ctx["jd_unique_words"])) * cfg["weight"])
+    return rule
+
+
+# ---------- POLICIES ----------
+def _merge(base, override):
+    out = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = _merge(out[key], value)
+        else:
+            out[key] = value
+    return out
+
+
+def compile_policy(policy=None):
+    # Unspecified keys fall back to DEFAULT_POLICY; a key set to null disables that rule
+    policy = _merge(DEFAULT_POLICY, policy or {})
+    rules = []
+    for key, cfg in policy.items():
+        if key in ("name", "clamp") or cfg is None:
+            continue
+        if key not in RULES:
+            raise ValueError(f"Unknown scoring rule '{key}' in policy '{policy['name']}'")
+        rules.append((key, RULES[key](cfg)))
+    low, high = policy["clamp"]
+    return {"name": policy["name"], "rules": rules, "clamp": (low, high)}
+
+
+def load_policies(path):
+    # A file holds either one policy object or {"policies": [...]} for A/B runs
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    policies = data["policies"] if isinstance(data, dict) and "policies" in data else [data]
+    return [compile_policy(p) for p in policies]
+
+
+_default_policy = None
+
+
+def default_policy():
+    global _default_policy
+    if _default_policy is None:
+        path = os.environ.get(POLICY_ENV)
+        _default_policy = load_policies(path)[0] if path else compile_policy()
+    return _default_policy
+
+
+def _compiled(policy):
+    # Accepts a compile_policy() result or a raw policy dict (compiled here)
+    if policy is None:
+        return default_policy()
+    if not isinstance(policy, dict):
+        raise TypeError(f"Scoring policy must be a dict, got {type(policy).__name__}")
+    return policy if "rules" in policy else compile_policy(policy)
+
+
+# ---------- SCORING ----------
+def score_context(skills, text, jd_text="", experience_years=None):
+    # Everything the rules need, derived once per resume and shared by all
+    # policies; `text` may be a str or an AnalyzedDocument
+    doc = as_document(text)
+    jd_text = jd_text or ""
+    jd_upper = jd_text.upper()
+    return {
+        "skills": skills,
+        "text": doc.text,
+        "text_lower": doc.lower,
+        "jd_text": jd_text,
+        "matched_skills": [s for s in skills if jd_upper and s.upper() in jd_upper],
+        "jd_unique_words": len(set(jd_text.split())),
+        "experience_years": experience_years,
+    }
+
+
+def score_breakdown(ctx, policy=None):
+    policy = _compiled(policy)
+    if not ctx["text"]:
+        return {"policy": policy["name"], "total": 0, "components": {}}
+    components = {name: rule(ctx) for name, rule in policy["rules"]}
+    low, high = policy["clamp"]
+    total = max(low, min(sum(components.values()), high))
+    return {"policy": policy["name"], "total": total, "components": components}
+
+
+def score_batch(resumes, policies, jd_text=""):
+    # resumes: dicts with "skills", "text" and optionally "experience_years"
+    # (e.g. analyze_resume() results). Returns one row per resume, one
+    # breakdown per policy, building each resume's context only once.
+    policies = [policies] if isinstance(policies, dict) else list(policies)
+    policies = [_compiled(p) for p in policies]  # once per batch, not per resume
+    rows = []
+    for r in resumes:
+        ctx = score_context(r["skills"], r["text"], jd_text, r.get("experience_years"))
+        rows.append([score_breakdown(ctx, p) for p in policies])
+    return rows
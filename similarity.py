@@ -0,0 +1,282 @@
+# similarity.py
+# "More candidates like this one": a persistent nearest-neighbour index over
+# resume text.
+#
+#   text -> hashed word uni/bi-grams (TF-IDF) -> SVD projection -> unit vector
+#   vectors are bucketed by random-projection LSH (n_tables x n_bits hyperplanes);
+#   a query re-ranks the union of its buckets by exact cosine similarity.
+#
+#   python similarity.py build  index/ resumes/*.pdf
+#   python similarity.py add    index/ new/*.pdf
+#   python similarity.py query  index/ star_candidate.pdf -k 10
+#
+# On disk every array is a .npy file opened with mmap_mode="r", so loading a
+# 100k-resume index is near-instant and pages are read only when touched.
+# Each save writes a new numbered version of the arrays and then swaps
+# meta.json, which names that version and holds the ids, in one rename.
+import argparse
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+
+from document import as_document
+
+_ARRAYS = ("idf", "components", "planes", "vectors", "codes", "order", "sorted_codes")
+_ARRAY_FILE_RE = re.compile(r"^(?P<name>[a-z_]+?)(?:\.(?P<version>\d+))?\.npy$")
+
+
+# ---------- FEATURES ----------
+def hashed_ngrams(text, n_features):
+    # Term counts over word unigrams and bigrams, hashed with crc32 so the
+    # buckets are stable across processes and runs
+    tokens = as_document(text).lower_tokens
+    counts = {}
+    for i, tok in enumerate(tokens):
+        for gram in (tok, tokens[i - 1] + " " + tok) if i else (tok,):
+            h = zlib.crc32(gram.encode("utf-8")) % n_features
+            counts[h] = counts.get(h, 0) + 1
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    return idx, 1.0 + np.log(tf)
+
+
+class SimilarityIndex:
+    def __init__(self, n_features=1 << 14, n_components=128, n_tables=8, n_bits=12, seed=0):
+        self.n_features = n_features
+        self.n_components = n_components
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.seed = seed
+        self.idf = None          # (n_features,)
+        self.components = None   # (n_components, n_features), rows from the SVD
+        self.planes = None       # (n_tables, n_bits, n_components) LSH hyperplanes
+        self.ids = []
+        self._pos = {}
+        # Persisted part (possibly memory-mapped) ...
+        self._vectors = np.zeros((0, n_components), dtype=np.float32)
+        self._codes = np.zeros((0, n_tables), dtype=np.int64)
+        self._sorted_codes = np.zeros((n_tables, 0), dtype=np.int64)
+        self._order = np.zeros((n_tables, 0), dtype=np.int64)
+        # ... and documents inserted since the last save
+        self._new_vectors = []
+        self._new_codes = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ---------- FITTING ----------
+    def fit(self, texts, max_docs=2000):
+        # Learns IDF weights and the SVD projection from a sample of the corpus;
+        # documents added later are projected with the same basis.
+        sample = list(texts)[:max_docs]
+        if not sample:
+            raise ValueError("fit() needs at least one document")
+        rows = [hashed_ngrams(t, self.n_features) for t in sample]
+        df = np.zeros(self.n_features, dtype=np.float32)
+        for idx, _ in rows:
+            df[idx] += 1
+        self.idf = (np.log((1 + len(sample)) / (1 + df)) + 1).astype(np.float32)
+
+        X = np.zeros((len(sample), self.n_features), dtype=np.float32)
+        for i, (idx, tf) in enumerate(rows):
+            X[i, idx] = tf * self.idf[idx]
+        _, _, vt = np.linalg.svd(X, full_matrices=False)
+        k = min(self.n_components, vt.shape[0])
+        self.components = np.zeros((self.n_components, self.n_features), dtype=np.float32)
+        self.components[:k] = vt[:k]
+
+        rng = np.random.default_rng(self.seed)
+        self.planes = rng.standard_normal(
+            (self.n_tables, self.n_bits, self.n_components)).astype(np.float32)
+        return self
+
+    def embed(self, text):
+        if self.components is None:
+            raise RuntimeError("index is not fitted; call fit() or load() first")
+        idx, tf = hashed_ngrams(text, self.n_features)
+        vec = self.components[:, idx] @ (tf * self.idf[idx]) if len(idx) else \
+            np.zeros(self.n_components, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return (vec / norm if norm else vec).astype(np.float32)
+
+    def _lsh_codes(self, vec):
+        bits = (self.planes @ vec) > 0                      # (n_tables, n_bits)
+        return bits.astype(np.int64) @ (1 << np.arange(self.n_bits, dtype=np.int64))
+
+    # ---------- INSERTS ----------
+    def add(self, doc_id, text):
+        if doc_id in self._pos:
+            return False
+        vec = self.embed(text)
+        self._pos[doc_id] = len(self.ids)
+        self.ids.append(doc_id)
+        self._new_vectors.append(vec)
+        self._new_codes.append(self._lsh_codes(vec))
+        return True
+
+    def add_many(self, items):
+        return sum(self.add(doc_id, text) for doc_id, text in items)
+
+    def _vector(self, pos):
+        n_base = len(self._vectors)
+        return self._vectors[pos] if pos < n_base else self._new_vectors[pos - n_base]
+
+    # ---------- QUERIES ----------
+    def _candidates(self, codes):
+        found = []
+        for t in range(self.n_tables):
+            sc = self._sorted_codes[t]
+            lo, hi = np.searchsorted(sc, codes[t], "left"), np.searchsorted(sc, codes[t], "right")
+            found.append(self._order[t, lo:hi])
+        if self._new_codes:
+            new = np.asarray(self._new_codes)                # (n_new, n_tables)
+            hits = np.nonzero((new == codes).any(axis=1))[0]
+            found.append(hits + len(self._vectors))
+        return np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+
+    def query(self, text=None, k=10, doc_id=None, exhaustive=False):
+        # Returns [(doc_id, cosine similarity)], best first. Pass doc_id to look
+        # up an already indexed resume; it is left out of its own results.
+        vec = self._vector(self._pos[doc_id]) if doc_id is not None else self.embed(text)
+        if exhaustive:
+            cand = np.arange(len(self.ids))
+        else:
+            cand = self._candidates(self._lsh_codes(vec))
+            if len(cand) <= k:  # sparse buckets: fall back to a full scan
+                cand = np.arange(len(self.ids))
+        if not len(cand):
+            return []
+        n_base = len(self._vectors)
+        base, new = cand[cand < n_base], cand[cand >= n_base]
+        mats = [np.asarray(self._vectors[base])]
+        if len(new):
+            mats.append(np.asarray([self._new_vectors[p - n_base] for p in new]))
+        sims = np.concatenate(mats) @ vec
+        cand = np.concatenate([base, new])
+        top = np.argsort(-sims)[: k + 1]
+        results = [(self.ids[cand[i]], float(sims[i])) for i in top if self.ids[cand[i]] != doc_id]
+        return results[:k]
+
+    # ---------- PERSISTENCE ----------
+    def save(self, path):
+        # Readers (and a crash mid-save) see either the previous meta.json and
+        # its arrays or the new ones, never new vectors with old ids. The
+        # previous version is kept for readers that loaded its meta.json just
+        # before the swap; older ones are removed.
+        os.makedirs(path, exist_ok=True)
+        version = _saved_version(path) + 1
+        vectors = np.array(self._vectors)
+        codes = np.array(self._codes)
+        if self._new_vectors:
+            vectors = np.concatenate([vectors, np.asarray(self._new_vectors)])
+            codes = np.concatenate([codes, np.asarray(self._new_codes)])
+        order = np.argsort(codes, axis=0, kind="stable").T  # (n_tables, N)
+        sorted_codes = np.take_along_axis(codes.T, order, axis=1)
+        arrays = {"idf": self.idf, "components": self.components, "planes": self.planes,
+                  "vectors": vectors, "codes": codes, "order": order, "sorted_codes": sorted_codes}
+        for name, arr in arrays.items():
+            with open(os.path.join(path, f"{name}.{version}.npy"), "wb") as fh:
+                np.save(fh, arr)
+                fh.flush()
+                os.fsync(fh.fileno())
+        meta = {"n_features": self.n_features, "n_components": self.n_components,
+                "n_tables": self.n_tables, "n_bits": self.n_bits, "seed": self.seed,
+                "version": version, "ids": self.ids}
+        tmp = os.path.join(path, "meta.tmp.json")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, os.path.join(path, "meta.json"))
+        # Only now, with everything on disk, does the index switch to the merged arrays
+        self._vectors, self._codes, self._sorted_codes, self._order = vectors, codes, sorted_codes, order
+        self._new_vectors, self._new_codes = [], []
+        _remove_versions_before(path, version - 1)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        index = cls(meta["n_features"], meta["n_components"], meta["n_tables"],
+                    meta["n_bits"], meta["seed"])
+        mode = "r" if mmap else None
+        # Indexes saved before versioning have plain "<name>.npy" files
+        suffix = f".{meta['version']}.npy" if "version" in meta else ".npy"
+        load = lambda name, mode=mode: np.load(os.path.join(path, name + suffix), mmap_mode=mode)
+        index.idf = load("idf", None)
+        index.components = load("components", None)
+        index.planes = load("planes", None)
+        index._vectors = load("vectors")
+        index._codes = load("codes")
+        index._order = load("order")
+        index._sorted_codes = load("sorted_codes")
+        index.ids = meta["ids"]
+        index._pos = {doc_id: i for i, doc_id in enumerate(index.ids)}
+        return index
+
+
+def _saved_version(path):
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            return json.load(fh).get("version", 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _remove_versions_before(path, version):
+    # Unversioned files from older indexes count as version 0
+    for fname in os.listdir(path):
+        m = _ARRAY_FILE_RE.match(fname)
+        if m and m.group("name") in _ARRAYS and int(m.group("version") or 0) < version:
+            try:
+                os.remove(os.path.join(path, fname))
+            except OSError:
+                pass  # still mapped by a reader on Windows; removed by a later save
+
+
+def main():
+    from resume_parser import extract_text_from_pdf
+
+    ap = argparse.ArgumentParser(description="Find resumes similar to a given one.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="fit a new index on the given PDFs")
+    b.add_argument("index")
+    b.add_argument("pdfs", nargs="+")
+    b.add_argument("--components", type=int, default=128)
+    a = sub.add_parser("add", help="insert PDFs into an existing index")
+    a.add_argument("index")
+    a.add_argument("pdfs", nargs="+")
+    q = sub.add_parser("query", help="list the resumes most similar to a PDF")
+    q.add_argument("index")
+    q.add_argument("pdf")
+    q.add_argument("-k", type=int, default=10)
+    args = ap.parse_args()
+
+    if args.cmd == "query":
+        index = SimilarityIndex.load(args.index)
+        key = os.path.abspath(args.pdf)
+        if key in index._pos:
+            hits = index.query(doc_id=key, k=args.k)
+        else:
+            hits = index.query(extract_text_from_pdf(args.pdf), k=args.k)
+        for doc_id, score in hits:
+            print(f"{score:.3f}  {doc_id}")
+        return
+
+    items = [(os.path.abspath(p), extract_text_from_pdf(p)) for p in args.pdfs]
+    if args.cmd == "build":
+        index = SimilarityIndex(n_components=args.components).fit(text for _, text in items)
+    else:
+        index = SimilarityIndex.load(args.index)
+    added = index.add_many(items)
+    index.save(args.index)
+    print(f"Added {added} resumes; index now holds {len(index)}")
+
+
+if __name__ == "__main__":
+    main()
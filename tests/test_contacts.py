@@ -0,0 +1,91 @@
+# test_contacts.py
+# Email/phone normalization and the grouped export.
+import csv
+import io
+
+import pytest
+
+from contacts import export_grouped, normalize_contacts, normalize_email, normalize_phone
+
+
+@pytest.fixture(autouse=True)
+def _default_region(monkeypatch):
+    monkeypatch.delenv("RESUME_DEFAULT_REGION", raising=False)
+
+
+@pytest.mark.parametrize("raw, region, expected", [
+    ("+91 98765 43210", None, "+919876543210"),
+    ("98765-43210", None, "+919876543210"),           # default region IN
+    ("098765 43210", None, "+919876543210"),          # trunk prefix
+    ("91 9876543210", None, "+919876543210"),         # country code without "+"
+    ("0091 98765 43210", None, "+919876543210"),
+    ("(415) 555-2671", "US", "+14155552671"),
+    ("+1 (415) 555-2671", "IN", "+14155552671"),      # explicit code wins
+    ("020 7946 0958", "gb", "+442079460958"),
+    ("12345", None, None),
+    ("98765 4321", None, None),                       # one digit short
+    ("+1234567890123456", None, None),                # longer than E.164
+])
+def test_normalize_phone(raw, region, expected):
+    assert normalize_phone(raw, region) == expected
+
+
+def test_normalize_phone_uses_region_from_environment(monkeypatch):
+    monkeypatch.setenv("RESUME_DEFAULT_REGION", "US")
+    assert normalize_phone("415-555-2671") == "+14155552671"
+
+
+def test_normalize_email():
+    assert normalize_email(" Jane.Doe@Example.COM. ") == "jane.doe@example.com"
+    assert normalize_email("not-an-email") is None
+
+
+def test_normalize_contacts_finds_every_contact_once():
+    text = ("Jane Doe | JANE@example.com | +91 98765 43210\n"
+            "Alt: jane.work@corp.io, 098765 43210, (415) 555-2671\n")
+    contacts = normalize_contacts(text, "IN")
+    assert contacts["emails"] == ["jane@example.com", "jane.work@corp.io"]
+    assert contacts["phones"] == ["+919876543210", "+914155552671"]  # local numbers use the region
+
+
+def test_normalize_contacts_skips_year_ranges_and_run_on_numbers():
+    text = "Engineer 2016 - 2018\nPhone: 080 2345 6789 2016\n"
+    assert normalize_contacts(text, "IN")["phones"] == ["+918023456789"]
+    assert normalize_contacts("", "IN") == {"emails": [], "phones": []}
+
+
+def _export(records):
+    out = io.StringIO()
+    groups = export_grouped(records, out, default_region="IN", chunk_size=2)
+    return groups, list(csv.DictReader(io.StringIO(out.getvalue())))
+
+
+def test_export_groups_by_identity_across_runs():
+    records = [
+        {"source": "a.pdf", "name": "Jane", "text": "jane@example.com 98765 43210", "ats_score": 60},
+        {"source": "b.pdf", "name": "Not found", "text": "JANE@example.com", "ats_score": 75},
+        {"source": "c.pdf", "name": "Raj", "text": "+91 91234 56789", "ats_score": 50},
+        {"source": "d.pdf", "name": "Nobody", "text": "no contact details", "ats_score": 10},
+    ]
+    groups, rows = _export(records)
+    assert groups == 3
+    jane = next(r for r in rows if r["identity"] == "email:jane@example.com")
+    assert (jane["name"], jane["resume_count"], jane["best_ats_score"], jane["best_source"]) == \
+        ("Jane", "2", "75", "b.pdf")
+    assert jane["phones"] == "+919876543210"
+    assert {r["identity"] for r in rows} >= {"phone:+919123456789", "source:d.pdf"}
+
+
+def test_export_uses_stored_contact_lists_without_text():
+    records = [{"source": "a.pdf", "email": "jane@example.com", "mobile_number": "98765 43210",
+                "emails": ["jane@example.com", "jane.alt@corp.io"],
+                "phones": ["+919876543210", "+14155552671"], "ats_score": 60}]
+    _groups, rows = _export(records)
+    assert rows[0]["emails"] == "jane@example.com;jane.alt@corp.io"
+    assert rows[0]["phones"] == "+919876543210;+14155552671"
+
+
+def test_export_falls_back_to_legacy_fields():
+    _groups, rows = _export([{"source": "a.pdf", "email": "Jane@Example.com", "mobile_number": "9876543210"}])
+    assert rows[0]["identity"] == "email:jane@example.com"
+    assert rows[0]["phones"] == "+919876543210"
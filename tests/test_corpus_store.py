@@ -0,0 +1,106 @@
+# test_corpus_store.py
+# CorpusStore round trips: append/read in one process, empty texts, refresh
+# with live views, and readers in other instances picking up appends.
+import hashlib
+
+import pytest
+
+from corpus_store import CorpusStore, cached_text
+
+
+def _key(n):
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = CorpusStore(str(tmp_path / "store"))
+    yield s
+    s.close()
+
+
+def test_read_back_in_appending_process(store):
+    assert store.append(_key(1), "hello")
+    assert store.get_text(_key(1)) == "hello"
+    assert store.append(_key(2), "wörld ✓")
+    assert store.get_text(_key(2)) == "wörld ✓"
+    assert len(store) == 2 and _key(1) in store
+
+
+def test_append_is_idempotent_per_key(store):
+    assert store.append(_key(1), "first")
+    assert not store.append(_key(1), "second")
+    assert store.get_text(_key(1)) == "first"
+    assert len(store) == 1
+
+
+def test_empty_texts(store):
+    store.append(_key(1), "")
+    assert store.get_text(_key(1)) == ""
+    assert bytes(store.get_bytes(_key(1))) == b""
+    store.append(_key(2), "text")
+    assert store.get_text(_key(2)) == "text"
+    assert store.get_text(_key(1)) == ""
+
+
+def test_views_survive_refresh_and_remap(store):
+    store.append(_key(1), "alpha")
+    view = store.get_bytes(_key(1))
+    other = CorpusStore(store.path)
+    other.append(_key(2), "beta" * 1000)  # grows the file, so refresh remaps
+    store.refresh()
+    assert bytes(view) == b"alpha"
+    assert store.get_text(_key(2)) == "beta" * 1000
+    store.close()
+    assert bytes(view) == b"alpha"
+    view.release()
+    other.close()
+
+
+def test_reopen_and_refresh_pick_up_appends(tmp_path):
+    path = str(tmp_path / "store")
+    writer = CorpusStore(path)
+    reader = CorpusStore(path)
+    writer.append(_key(1), "one")
+    assert _key(1) not in reader
+    reader.refresh()
+    assert reader.get_text(_key(1)) == "one"
+    writer.append(_key(2), "two")
+    writer.close()
+    reader.close()
+
+    reopened = CorpusStore(path)
+    assert list(reopened.iter_texts()) == [(_key(1), "one"), (_key(2), "two")]
+    reopened.close()
+
+
+def test_half_written_index_record_is_ignored(tmp_path):
+    path = str(tmp_path / "store")
+    s = CorpusStore(path)
+    s.append(_key(1), "kept")
+    s.close()
+    with open(tmp_path / "store" / "corpus.idx", "ab") as fh:
+        fh.write(b"\0" * 10)
+    s = CorpusStore(path)
+    assert list(s.iter_texts()) == [(_key(1), "kept")]
+    assert s.append(_key(2), "after the tear")
+    s.close()
+
+    s = CorpusStore(path)
+    assert list(s.iter_texts()) == [(_key(1), "kept"), (_key(2), "after the tear")]
+    assert _key(2) in s
+    s.close()
+
+
+def test_cached_text_extracts_each_pdf_once(store, tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake")
+    calls = []
+
+    def extract(path):
+        calls.append(path)
+        return "parsed"
+
+    assert cached_text(store, str(pdf), extract) == "parsed"
+    assert cached_text(store, str(pdf), extract) == "parsed"
+    assert len(calls) == 1
@@ -0,0 +1,84 @@
+# test_distributed.py
+# SQLiteBroker semantics on a temporary database: idempotent submission,
+# leases and their expiry, first-completion-wins and giving up on a task.
+import pytest
+
+from distributed import Broker, SQLiteBroker, make_broker, submit_job
+
+
+@pytest.fixture
+def broker(tmp_path):
+    return SQLiteBroker(str(tmp_path / "broker.db"), max_attempts=2)
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    paths = []
+    for name, data in (("a.pdf", b"%PDF a"), ("b.pdf", b"%PDF b"), ("a_copy.pdf", b"%PDF a")):
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(str(path))
+    return paths
+
+
+def test_resubmission_and_duplicate_pdfs_are_deduplicated(broker, pdfs):
+    job, added = submit_job(broker, pdfs, "jd", shard_size=1)
+    assert added == 2  # a_copy.pdf has the same content as a.pdf
+    assert submit_job(broker, pdfs, "jd", shard_size=1) == (job, 0)
+    assert broker.progress(job) == {"pending": 2, "leased": 0, "done": 0, "failed": 0}
+    other, added = submit_job(broker, pdfs[:1], "another jd")
+    assert other != job and added == 1
+
+
+def test_lease_is_exclusive_until_it_expires(broker, pdfs):
+    job, _ = submit_job(broker, pdfs, "jd", shard_size=1)
+    first = broker.lease("w1", 1, lease_seconds=60)
+    assert len(first) == 1 and first[0][1:] == (job, pdfs[0], "jd")  # lowest shard first
+    second = broker.lease("w2", 10, lease_seconds=60)
+    assert [t[2] for t in second] == [pdfs[1]]
+    assert broker.lease("w3", 10, lease_seconds=60) == []
+
+
+def test_expired_lease_is_handed_out_again_and_first_completion_wins(broker, pdfs):
+    job, _ = submit_job(broker, pdfs[:1], "jd")
+    (task_id, *_), = broker.lease("slow", 1, lease_seconds=-1)  # expires immediately
+    (again, *_), = broker.lease("fast", 1, lease_seconds=60)
+    assert again == task_id
+    assert broker.complete(task_id, "fast", {"ats_score": 70})
+    assert not broker.complete(task_id, "slow", {"ats_score": 10})
+    assert list(broker.results(job)) == [(task_id, pdfs[0], {"ats_score": 70})]
+    assert broker.progress(job)["done"] == 1
+
+
+def test_fail_only_counts_for_the_lease_holder(broker, pdfs):
+    job, _ = submit_job(broker, pdfs[:1], "jd")
+    (task_id, *_), = broker.lease("w1", 1, lease_seconds=60)
+    broker.fail(task_id, "someone-else", "ignored")
+    assert broker.progress(job)["leased"] == 1
+    broker.fail(task_id, "w1", "boom")
+    assert broker.progress(job)["pending"] == 1
+    broker.lease("w1", 1, lease_seconds=60)
+    broker.fail(task_id, "w1", "boom again")  # second attempt of max_attempts=2
+    assert broker.progress(job) == {"pending": 0, "leased": 0, "done": 0, "failed": 1}
+    assert broker.lease("w1", 1, lease_seconds=60) == []
+
+
+def test_task_whose_leases_keep_expiring_is_given_up(broker, pdfs):
+    job, _ = submit_job(broker, pdfs[:1], "jd")
+    assert len(broker.lease("w1", 1, lease_seconds=-1)) == 1
+    assert len(broker.lease("w2", 1, lease_seconds=-1)) == 1
+    assert broker.lease("w3", 1, lease_seconds=60) == []
+    assert broker.progress(job)["failed"] == 1
+
+
+def test_make_broker_and_abstract_interface(tmp_path):
+    assert isinstance(make_broker(f"sqlite://{tmp_path / 'b.db'}"), SQLiteBroker)
+    with pytest.raises(ValueError):
+        make_broker("redis://localhost")
+
+    class Incomplete(Broker):
+        def create_job(self, job_id, jd_text):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
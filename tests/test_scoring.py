@@ -0,0 +1,103 @@
+# test_scoring.py
+# The rule engine: DEFAULT_POLICY against the original hardcoded scorer,
+# policy merging and disabling, and score_batch over several policies.
+import random
+
+import pytest
+
+from scoring import DEFAULT_POLICY, compile_policy, score_batch, score_breakdown, score_context
+
+
+def legacy_ats_score(skills, text, jd_text="", experience_years=None):
+    # calculate_ats_score as it was before scoring.py existed
+    if not text:
+        return 0
+    score = 20
+    jd_text_upper = jd_text.upper() if jd_text else ""
+    matched_skills = [s for s in skills if jd_text_upper and s.upper() in jd_text_upper]
+    if jd_text:
+        score += min(len(matched_skills) * 8, 50)
+    else:
+        score += min(len(skills) * 5, 40)
+    section_keywords = ["experience", "education", "project", "certification"]
+    score += sum(5 for kw in section_keywords if kw in text.lower())
+    if "experience" not in text.lower():
+        score -= 5
+    if "education" not in text.lower():
+        score -= 5
+    if experience_years:
+        score += min(int(experience_years) * 2, 10)
+    if jd_text and skills:
+        score += int((len(matched_skills) / max(1, len(set(jd_text.split())))) * 30)
+    return max(0, min(score, 100))
+
+
+SKILLS = ["Python", "Java", "SQL", "AWS", "Docker", "React", "Excel", "Git", "Linux", "C++"]
+WORDS = ["experience", "Education", "projects", "certification", "team", "built", "led", "data"]
+
+
+def _random_case(rng):
+    skills = rng.sample(SKILLS, rng.randint(0, len(SKILLS)))
+    text = " ".join(rng.choice(WORDS + SKILLS) for _ in range(rng.randint(0, 30)))
+    jd = " ".join(rng.choice(SKILLS + WORDS) for _ in range(rng.randint(0, 15))) if rng.random() < 0.7 else ""
+    years = rng.choice([None, 0.0, 0.5, 1.2, 3.0, 7.9, 20.0])
+    return skills, text, jd, years
+
+
+def test_default_policy_matches_legacy_scorer():
+    rng = random.Random(1234)
+    policy = compile_policy()
+    for _ in range(3000):
+        skills, text, jd, years = _random_case(rng)
+        ctx = score_context(skills, text, jd, years)
+        assert score_breakdown(ctx, policy)["total"] == legacy_ats_score(skills, text, jd, years)
+
+
+def test_breakdown_components_sum_to_unclamped_total():
+    ctx = score_context(["Python", "SQL"], "Experience and education", "Python developer", 3.0)
+    result = score_breakdown(ctx, compile_policy())
+    assert result["policy"] == "default"
+    assert result["components"] == {"base": 20, "skills": 8, "sections": 10,
+                                    "missing_section_penalties": 0, "experience": 6, "coverage": 15}
+    assert result["total"] == sum(result["components"].values())
+
+
+def test_policy_overrides_merge_and_null_disables():
+    policy = compile_policy({"name": "custom", "skills": {"per_jd_match": 20}, "experience": None})
+    assert [name for name, _ in policy["rules"]] == [
+        "base", "skills", "sections", "missing_section_penalties", "coverage"]
+    ctx = score_context(["Python", "SQL", "AWS"], "experience education", "Python SQL AWS", 10)
+    components = score_breakdown(ctx, policy)["components"]
+    assert components["skills"] == 50  # 3 x 20, capped by the inherited jd_cap
+    assert "experience" not in components
+    assert DEFAULT_POLICY["skills"]["per_jd_match"] == 8  # the default is not mutated
+
+
+def test_unknown_rule_is_rejected():
+    with pytest.raises(ValueError, match="bogus"):
+        compile_policy({"name": "bad", "bogus": 1})
+
+
+def test_empty_text_scores_zero():
+    assert score_breakdown(score_context(["Python"], ""), compile_policy())["total"] == 0
+
+
+def test_score_batch_scores_every_resume_under_every_policy():
+    resumes = [{"skills": ["Python"], "text": "experience education", "experience_years": 2},
+               {"skills": [], "text": "nothing relevant"},
+               {"skills": SKILLS, "text": "projects"}]
+    policies = [compile_policy(), {"name": "flat", "base": 50, "skills": None, "coverage": None}]
+    rows = score_batch(resumes, policies, "Python role")
+    assert len(rows) == 3 and all(len(row) == 2 for row in rows)
+    assert [b["policy"] for b in rows[0]] == ["default", "flat"]
+    for resume, row in zip(resumes, rows):
+        expected = legacy_ats_score(resume["skills"], resume["text"], "Python role",
+                                    resume.get("experience_years"))
+        assert row[0]["total"] == expected
+    assert "skills" not in rows[0][1]["components"]
+
+
+def test_raw_policy_dicts_are_compiled():
+    ctx = score_context(["Python"], "experience")
+    assert score_breakdown(ctx, {"name": "raw", "base": 0})["policy"] == "raw"
+    assert score_batch([{"skills": [], "text": "x"}], {"name": "raw"})[0][0]["policy"] == "raw"
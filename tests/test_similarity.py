@@ -0,0 +1,93 @@
+# test_similarity.py
+# SimilarityIndex: fit, incremental adds, queries, and save/load round trips
+# including a save that fails partway.
+import os
+import random
+
+import numpy as np
+import pytest
+
+import similarity
+from similarity import SimilarityIndex
+
+SKILLS = ["python", "java", "sql", "aws", "docker", "react", "excel", "tableau", "kotlin", "swift",
+          "pandas", "spark", "linux", "figma", "django", "flask"]
+
+
+def _corpus(n, seed=7):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        focus = rng.sample(SKILLS, 4)
+        texts.append(" ".join(rng.choice(focus if rng.random() < 0.8 else SKILLS) for _ in range(60)))
+    return texts
+
+
+@pytest.fixture
+def index():
+    texts = _corpus(40)
+    ix = SimilarityIndex(n_features=1 << 10, n_components=16, n_tables=4, n_bits=6).fit(texts)
+    ix.add_many((f"r{i}", t) for i, t in enumerate(texts))
+    return ix, texts
+
+
+def test_query_finds_the_same_resume_first(index):
+    ix, texts = index
+    assert len(ix) == 40
+    best, score = ix.query(texts[3], k=3)[0]
+    assert best == "r3" and score == pytest.approx(1.0, abs=1e-5)
+    assert all(doc != "r3" for doc, _ in ix.query(doc_id="r3", k=5))
+    assert not ix.add("r3", "duplicate id is ignored")
+
+
+def test_lsh_results_agree_with_exhaustive_scan(index):
+    ix, texts = index
+    for t in texts[:5]:
+        assert [d for d, _ in ix.query(t, k=1)] == [d for d, _ in ix.query(t, k=1, exhaustive=True)]
+
+
+def test_save_load_and_incremental_add(index, tmp_path):
+    ix, texts = index
+    path = str(tmp_path / "index")
+    ix.save(path)
+    loaded = SimilarityIndex.load(path)
+    assert loaded.ids == ix.ids
+    assert loaded.query(texts[7], k=5) == ix.query(texts[7], k=5)
+
+    extra = _corpus(5, seed=99)
+    loaded.add_many((f"new{i}", t) for i, t in enumerate(extra))
+    assert loaded.query(extra[2], k=1)[0][0] == "new2"  # unsaved inserts are queryable
+    loaded.save(path)
+    reloaded = SimilarityIndex.load(path, mmap=False)
+    assert len(reloaded) == 45
+    assert reloaded.query(extra[2], k=1)[0][0] == "new2"
+    assert reloaded.query(texts[7], k=1)[0][0] == "r7"
+    versions = {f.split(".")[1] for f in os.listdir(path) if f.endswith(".npy")}
+    assert versions == {"1", "2"}  # the previous version is kept for racing readers
+
+
+def test_failed_save_keeps_index_and_unsaved_inserts(index, tmp_path, monkeypatch):
+    ix, texts = index
+    path = str(tmp_path / "index")
+    ix.save(path)
+    ix.add("late", "kotlin swift android kotlin swift")
+
+    def disk_full(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(similarity.np, "save", disk_full)
+    with pytest.raises(OSError):
+        ix.save(path)
+    monkeypatch.undo()
+
+    assert ix.query("kotlin swift android kotlin swift", k=1)[0][0] == "late"
+    assert ix.query(texts[0], k=1)[0][0] == "r0"
+    assert SimilarityIndex.load(path).ids == [f"r{i}" for i in range(40)]  # old version intact
+    ix.save(path)
+    assert SimilarityIndex.load(path).ids[-1] == "late"
+
+
+def test_unfitted_index_refuses_to_embed():
+    with pytest.raises(RuntimeError):
+        SimilarityIndex().embed("python")
+    assert isinstance(SimilarityIndex(n_components=4).fit(["a b", "c d"]).embed("a b"), np.ndarray)
@@ -0,0 +1,65 @@
+# test_work_history.py
+# Behaviour of analyzer.extract_work_history: date formats, the end-of-range
+# convention, overlap merging and the experience-section fallback.
+import datetime
+
+from analyzer import extract_work_history
+
+TODAY = datetime.date(2024, 6, 15)
+
+
+def _history(text):
+    return extract_work_history(text, today=TODAY)
+
+
+def test_present_runs_through_current_month():
+    h = _history("Experience\nSoftware Engineer, Acme\nJan 2023 - Present")
+    assert h["total_months"] == 18  # Jan 2023 .. Jun 2024 inclusive
+    assert h["roles"][0]["start"] == "2023-01"
+    assert h["roles"][0]["end"] == "2024-06"
+    assert h["roles"][0]["title"] == "Software Engineer, Acme"
+
+
+def test_month_names_and_numeric_dates_include_end_month():
+    assert _history("Experience\nAnalyst Mar 2019 - Feb 2020")["total_months"] == 12
+    assert _history("Experience\nAnalyst 03/2019 - 02/2020")["total_months"] == 12
+    assert _history("Experience\nAnalyst 3.2019 to 2.2020")["total_months"] == 12
+
+
+def test_year_only_ranges_include_end_year():
+    assert _history("Experience\nDeveloper 2017 - 2018")["total_months"] == 24
+    assert _history("Experience\nDeveloper 2018 - 2018")["total_months"] == 12
+    h = _history("Experience\nDeveloper 2016 – 2018")
+    assert (h["roles"][0]["start"], h["roles"][0]["end"]) == ("2016-01", "2018-12")
+
+
+def test_overlapping_roles_are_not_double_counted():
+    h = _history("Experience\nLead Jan 2018 - Dec 2019\nConsultant Jun 2019 - Jun 2020")
+    assert len(h["roles"]) == 2
+    assert h["total_months"] == 30  # Jan 2018 .. Jun 2020
+    assert h["total_years"] == 2.5
+
+
+def test_ranges_outside_experience_section_are_ignored():
+    text = ("Education\nB.Tech 2010 - 2014\n"
+            "Work Experience\nEngineer Jan 2020 - Dec 2020\n"
+            "Projects\nHackathon 2021 - 2021")
+    h = _history(text)
+    assert [r["start"] for r in h["roles"]] == ["2020-01"]
+    assert h["total_months"] == 12
+
+
+def test_heading_without_dated_roles_does_not_borrow_other_sections():
+    h = _history("Experience\nIntern at Acme\nEducation\nB.Tech 2015 - 2019")
+    assert h == {"roles": [], "total_months": 0, "total_years": 0.0}
+
+
+def test_without_heading_uses_whole_text():
+    h = _history("Jane Doe\nEngineer at Globex 2015 - 2016\nIntern Jun 2014 - Aug 2014")
+    assert h["total_months"] == 27
+
+
+def test_future_and_empty_inputs():
+    assert _history("Experience\nStarting Jan 2030 - Present")["total_months"] == 0
+    assert _history("") == {"roles": [], "total_months": 0, "total_years": 0.0}
+    assert _history("No dates here at all")["total_months"] == 0
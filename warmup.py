@@ -0,0 +1,264 @@
+# warmup.py
+# Preloads everything the first upload would otherwise pay for lazily: PDF
+# libraries, the skill matcher, scoring policy, matplotlib/WordCloud fonts,
+# the course lists and (when enabled) the spaCy model.
+#
+# Start the app through this module so warm-up happens at server start rather
+# than on the first page view; the readiness marker is written once the server
+# is warm and accepting connections. Point the load balancer's probe at --check:
+#
+#   python warmup.py --serve [--server.port 8501 ...]   # streamlit run App.py, pre-warmed
+#   python warmup.py --check [--port 8501]              # exit code 0 once that server is ready
+#
+# App.py still runs warm_up() once per server process through st.cache_resource
+# (a no-op cost after --serve). Warm-up also starts the shared analysis pool
+# (analysis_pool()) and waits until every worker has run warm_worker(), so the
+# first multi-upload pays neither process spawn nor model loading. The marker is per port and records the server's PID, so a
+# killed process's leftover marker never reports a restarted replica as ready.
+import atexit
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+READY_FILE_ENV = "RESUME_READY_FILE"
+DEFAULT_PORT = 8501
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "App.py")
+
+
+def server_port(port=None):
+    return int(port or os.environ.get("STREAMLIT_SERVER_PORT") or DEFAULT_PORT)
+
+
+def ready_file(port=None):
+    default = os.path.join(tempfile.gettempdir(), f"resume_analyser.{server_port(port)}.ready")
+    return os.environ.get(READY_FILE_ENV, default)
+
+
+def _timed(timings, name, func):
+    start = time.perf_counter()
+    func()
+    timings[name] = round(time.perf_counter() - start, 4)
+
+
+# ---------- STEPS ----------
+def _pdf_libs():
+    import PyPDF2  # noqa: F401
+    try:
+        import fitz  # noqa: F401  (resume_parser / batch tools)
+    except ImportError:
+        pass
+
+
+def _matchers():
+    from analyzer import extract_skills, extract_work_history
+    from contacts import normalize_contacts
+    from scoring import default_policy
+    sample = "Python SQL experience education\nEngineer Jan 2020 - Present\njane@example.com +91 98765 43210"
+    extract_skills(sample)
+    extract_work_history(sample)
+    normalize_contacts(sample)
+    default_policy()
+
+
+def _courses():
+    import Courses  # noqa: F401
+
+
+def _fonts():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+    # Drawing text forces the font cache to load; generate() loads WordCloud's font
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.text(0.5, 0.5, "warm up")
+    fig.canvas.draw()
+    plt.close(fig)
+    WordCloud(width=64, height=32).generate("warm up")
+
+
+def _ner():
+    import ner
+    if ner.ner_enabled():
+        ner.get_nlp()
+
+
+def warm_worker():
+    # ProcessPoolExecutor initializer: only what analyze_resume() needs
+    _pdf_libs()
+    _matchers()
+    _ner()
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_marker(port=None):
+    try:
+        with open(ready_file(port), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_marker(port=None):
+    # Removes a marker left by an earlier server on this port (e.g. SIGKILLed)
+    try:
+        os.remove(ready_file(port))
+    except FileNotFoundError:
+        pass
+
+
+def mark_ready(report, port=None):
+    path = ready_file(port)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(report, fh)
+    os.replace(tmp, path)
+
+    def _remove_own_marker():
+        # Only if it is still ours: another server may have taken the port since
+        marker = read_marker(port)
+        if marker and marker.get("pid") == os.getpid():
+            clear_marker(port)
+    atexit.register(_remove_own_marker)
+
+
+# ---------- SHARED ANALYSIS POOL ----------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_size():
+    return os.cpu_count() or 1
+
+
+def analysis_pool():
+    # One process pool per server process, shared by every session
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_pool_size(), initializer=warm_worker)
+        return _pool
+
+
+def replace_analysis_pool(broken):
+    # After a BrokenProcessPool (a worker was OOM-killed...); the next
+    # analysis_pool() call starts a fresh one
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            broken.shutdown(wait=False)
+            _pool = None
+
+
+def _ping():
+    time.sleep(0.05)  # long enough that one fast worker cannot answer every ping
+    return os.getpid()
+
+
+def _prime_pool(timeout=300.0):
+    # Keeps one ping per worker in flight until every worker has answered; a
+    # worker only takes tasks after its initializer, so each answer means
+    # that worker has started and run warm_worker()
+    pool, seen = analysis_pool(), set()
+    deadline = time.time() + timeout
+    while len(seen) < _pool_size() and time.time() < deadline:
+        seen.update(f.result() for f in [pool.submit(_ping) for _ in range(_pool_size())])
+
+
+def warm_up(write_marker=True, port=None):
+    timings = {}
+    started = time.perf_counter()
+    # The pool goes last: on fork-based platforms its workers inherit the rest
+    for name, step in (("pdf_libs", _pdf_libs), ("matchers", _matchers), ("courses", _courses),
+                       ("fonts", _fonts), ("ner_model", _ner), ("analysis_pool", _prime_pool)):
+        _timed(timings, name, step)
+    report = {"pid": os.getpid(), "warmup_seconds": round(time.perf_counter() - started, 4),
+              "steps": timings, "ready_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+    print(f"Warm-up finished in {report['warmup_seconds']:.2f}s: {timings}", flush=True)
+    if write_marker:
+        mark_ready(report, port)
+    return report
+
+
+def is_ready(port=None):
+    marker = read_marker(port)
+    return bool(marker) and _pid_alive(marker["pid"])
+
+
+# ---------- SERVER START ----------
+def _port_from_args(args, flag="--server.port"):
+    for i, arg in enumerate(args):
+        if arg.startswith(flag + "="):
+            return int(arg.split("=", 1)[1])
+        if arg == flag and i + 1 < len(args):
+            return int(args[i + 1])
+    return server_port()
+
+
+def _mark_when_listening(report, port, timeout=300.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1.0).close()
+        except OSError:
+            time.sleep(0.5)
+            continue
+        mark_ready(report, port)
+        return
+
+
+def serve(streamlit_args):
+    # Warm this process, then hand it to `streamlit run App.py`: the app's
+    # sessions run in this same process and find everything already loaded
+    from streamlit.web import cli as stcli
+
+    port = _port_from_args(streamlit_args)
+    clear_marker(port)
+    report = warm_up(write_marker=False, port=port)
+    threading.Thread(target=_mark_when_listening, args=(report, port), daemon=True).start()
+    sys.argv = ["streamlit", "run", APP_SCRIPT, *streamlit_args]
+    sys.exit(stcli.main())
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--serve"]:
+        serve(args[1:])
+        return
+    if "--check" in args:
+        port = _port_from_args(args, flag="--port")
+        if not is_ready(port):
+            print("not ready")
+            sys.exit(1)
+        print(json.dumps(read_marker(port)))
+        return
+    # Standalone run: measure warm-up cost without touching the marker
+    print(json.dumps(warm_up(write_marker=False), indent=2))
+
+
+if __name__ == "__main__":
+    # Run as the importable "warmup" module, so App.py (which imports it) finds
+    # the pool and state that --serve warmed up instead of a second copy
+    import warmup
+    warmup.main()
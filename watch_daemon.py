@@ -0,0 +1,401 @@
+# watch_daemon.py
+# Long-running folder watcher: new PDFs dropped into a directory are put on a
+# durable SQLite queue and scored through resume_parser.score_resume.
+#
+#   python watch_daemon.py /shared/resumes --jd job.txt --workers 4
+#
+# Completed files are remembered by content hash, so restarting the daemon (or
+# dropping the same PDF twice) never reprocesses them.
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from corpus_store import CorpusStore
+from resume_parser import score_resume
+
+try:  # inotify/FSEvents via watchdog when available, polling otherwise
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+
+# ---------- DURABLE QUEUE ----------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    path         TEXT NOT NULL,
+    sha256       TEXT NOT NULL UNIQUE,
+    mtime        REAL NOT NULL,
+    size         INTEGER NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    crashes      INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    last_error   TEXT,
+    result       TEXT,
+    experience_years REAL,
+    enqueued_at  REAL NOT NULL,
+    finished_at  REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, next_attempt);
+"""
+# Indexes that depend on columns added after the first release
+INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_experience ON jobs (experience_years) WHERE status = 'done';
+"""
+
+
+class WorkQueue:
+    # One SQLite connection per thread; WAL lets the scanner and the workers
+    # write without blocking each other for long.
+    def __init__(self, db_path, max_attempts=5, backoff=2.0, max_backoff=300.0, max_crashes=3,
+                 read_only=False):
+        # read_only: for screening a live daemon's queue; no schema changes or writes
+        self.db_path = db_path
+        self.read_only = read_only
+        self.max_attempts = max_attempts
+        self.max_crashes = max_crashes
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._local = threading.local()
+        if read_only:
+            return
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "experience_years" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN experience_years REAL")
+        if "crashes" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN crashes INTEGER NOT NULL DEFAULT 0")
+        conn.executescript(INDEXES)
+        conn.commit()
+
+    def recover_stale(self):
+        # Only the daemon calls this at start-up: anything left 'running' belongs
+        # to a previous, interrupted process. Readers (--screen) must not, or
+        # they would requeue a live daemon's in-flight jobs.
+        conn = self._conn()
+        cur = conn.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+        conn.commit()
+        return cur.rowcount
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.read_only:
+                uri = pathlib.Path(self.db_path).absolute().as_uri() + "?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, timeout=30)
+            else:
+                conn = sqlite3.connect(self.db_path, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def known_files(self):
+        rows = self._conn().execute("SELECT path, mtime, size FROM jobs")
+        return {path: (mtime, size) for path, mtime, size in rows}
+
+    def enqueue(self, path, sha256, mtime, size):
+        conn = self._conn()
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO jobs (path, sha256, mtime, size, enqueued_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (path, sha256, mtime, size, time.time()),
+        )
+        conn.commit()
+        return cur.rowcount == 1
+
+    def claim(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, path, sha256 FROM jobs WHERE status = 'pending' AND next_attempt <= ? "
+                "ORDER BY next_attempt, id LIMIT 1",
+                (time.time(),),
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1 WHERE id = ?",
+                    (row[0],),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def complete(self, job_id, result):
+        conn = self._conn()
+        conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, experience_years = ?, last_error = NULL, "
+            "finished_at = ? WHERE id = ?",
+            (json.dumps(result), result.get("experience_years"), time.time(), job_id),
+        )
+        conn.commit()
+
+    def fail(self, job_id, error):
+        conn = self._conn()
+        (attempts,) = conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if attempts >= self.max_attempts:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', last_error = ?, finished_at = ? WHERE id = ?",
+                (error, time.time(), job_id),
+            )
+        else:
+            delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', last_error = ?, next_attempt = ? WHERE id = ?",
+                (error, time.time() + delay, job_id),
+            )
+        conn.commit()
+
+    def release(self, job_id, error):
+        # The process pool died while this job was in flight. Any in-flight job
+        # is caught by that, so it is requeued without spending a retry attempt;
+        # only a job present at max_crashes pool crashes (most likely the PDF
+        # that kills its worker) is given up on.
+        conn = self._conn()
+        conn.execute(
+            "UPDATE jobs SET attempts = attempts - 1, crashes = crashes + 1, last_error = ?, "
+            "status = CASE WHEN crashes + 1 >= ? THEN 'failed' ELSE 'pending' END, "
+            "finished_at = CASE WHEN crashes + 1 >= ? THEN ? END WHERE id = ?",
+            (error, self.max_crashes, self.max_crashes, time.time(), job_id),
+        )
+        conn.commit()
+
+    def screen(self, min_years=0.0, max_years=None):
+        # Completed resumes within a tenure range, served from the jobs_experience index
+        sql = "SELECT path, experience_years, result FROM jobs WHERE status = 'done' AND experience_years >= ?"
+        params = [min_years]
+        if max_years is not None:
+            sql += " AND experience_years <= ?"
+            params.append(max_years)
+        sql += " ORDER BY experience_years DESC"
+        return [(path, years, json.loads(result)) for path, years, result in self._conn().execute(sql, params)]
+
+    def stats(self):
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+
+# ---------- FOLDER SCANNING ----------
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_folder(folder, queue, known, settle=2.0):
+    # A file is only picked up once its mtime is `settle` seconds old, so
+    # half-copied uploads on a network share are not hashed prematurely.
+    added = 0
+    now = time.time()
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            if not name.lower().endswith(".pdf"):
+                continue
+            path = os.path.abspath(os.path.join(root, name))
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            sig = (st.st_mtime, st.st_size)
+            if known.get(path) == sig or now - st.st_mtime < settle:
+                continue
+            try:
+                sha = file_sha256(path)
+            except OSError:
+                continue
+            known[path] = sig
+            if queue.enqueue(path, sha, st.st_mtime, st.st_size):
+                added += 1
+    return added
+
+
+def start_watcher(folder, wake):
+    if Observer is None:
+        return None
+
+    class _Wake(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
+
+    observer = Observer()
+    observer.schedule(_Wake(), folder, recursive=True)
+    observer.start()
+    return observer
+
+
+# ---------- WORKERS ----------
+class ScoringPool:
+    # The ProcessPoolExecutor shared by the worker threads. One child dying
+    # (a PyMuPDF segfault, an OOM kill) breaks an executor for good, so the
+    # first thread to notice replaces it and the others pick up the new one.
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def current(self):
+        return self._pool
+
+    def replace(self, broken):
+        with self._lock:
+            if self._pool is broken:
+                broken.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                print("Worker process died; replaced the process pool", flush=True)
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+
+def worker_loop(queue, pool, jd_text, stop, wake, counter, corpus=None):
+    while not stop.is_set():
+        job = queue.claim()
+        if job is None:
+            wake.wait(1.0)
+            continue
+        job_id, path, sha256 = job
+        executor = pool.current()
+        try:
+            result = executor.submit(score_resume, path, jd_text).result()
+            if result is None:
+                raise RuntimeError("parse_resume returned no data")
+            text = result.pop("text", "")
+            if corpus is not None:
+                with counter["lock"]:  # CorpusStore allows one writer at a time
+                    corpus.append(sha256, text)
+            queue.complete(job_id, result)
+        except BrokenProcessPool as e:
+            # Not this job's fault as far as we know: new pool, no attempt spent
+            pool.replace(executor)
+            queue.release(job_id, f"{type(e).__name__}: {e}")
+            continue
+        except Exception as e:
+            # Scoring, corpus IO and queue errors alike: retry with backoff
+            # instead of killing this thread and leaving the job 'running'
+            queue.fail(job_id, f"{type(e).__name__}: {e}")
+            print(f"Retrying later: {path} ({e})", flush=True)
+            continue
+        with counter["lock"]:
+            counter["done"] += 1
+
+
+def report(queue, counter, started, last):
+    counts = queue.stats()
+    now = time.time()
+    with counter["lock"]:
+        done = counter["done"]
+    recent = (done - last["done"]) / max(now - last["time"], 1e-9)
+    overall = done / max(now - started, 1e-9)
+    print(
+        f"queue depth={counts['pending'] + counts['running']} "
+        f"(pending={counts['pending']} running={counts['running']}) "
+        f"done={counts['done']} failed={counts['failed']} "
+        f"throughput={recent:.2f}/s (session avg {overall:.2f}/s)",
+        flush=True,
+    )
+    last["done"], last["time"] = done, now
+
+
+# ---------- MAIN FUNCTION ----------
+def run(folder, db_path, jd_text="", workers=2, poll_interval=5.0, report_interval=30.0,
+        max_attempts=5, backoff=2.0, corpus_dir=None, max_crashes=3):
+    queue = WorkQueue(db_path, max_attempts=max_attempts, backoff=backoff, max_crashes=max_crashes)
+    queue.recover_stale()
+    corpus = CorpusStore(corpus_dir) if corpus_dir else None
+    known = queue.known_files()
+    stop, wake = threading.Event(), threading.Event()
+    counter = {"done": 0, "lock": threading.Lock()}
+    observer = start_watcher(folder, wake)
+    print(f"Watching {folder} with {workers} workers "
+          f"({'inotify/watchdog' if observer else 'polling'}), queue at {db_path}")
+
+    started = time.time()
+    last = {"done": 0, "time": started}
+    next_report = started + report_interval
+    pool = ScoringPool(workers)
+    try:
+        threads = [
+            threading.Thread(target=worker_loop, args=(queue, pool, jd_text, stop, wake, counter, corpus),
+                             daemon=True)
+            for _ in range(workers)
+        ]
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                if scan_folder(folder, queue, known):
+                    wake.set()
+                if time.time() >= next_report:
+                    report(queue, counter, started, last)
+                    next_report = time.time() + report_interval
+                wake.wait(poll_interval)
+                wake.clear()
+        except KeyboardInterrupt:
+            print("Shutting down...")
+        finally:
+            stop.set()
+            wake.set()
+            if observer:
+                observer.stop()
+                observer.join()
+            for t in threads:
+                t.join()
+    finally:
+        pool.shutdown()
+    report(queue, counter, started, last)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Watch a folder and score incoming resumes.")
+    ap.add_argument("folder", nargs="?", help="folder to watch (not needed with --screen)")
+    ap.add_argument("--db", default="resume_queue.sqlite3", help="SQLite queue file")
+    ap.add_argument("--jd", help="text file with the job description to score against")
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--poll-interval", type=float, default=5.0)
+    ap.add_argument("--report-interval", type=float, default=30.0)
+    ap.add_argument("--max-attempts", type=int, default=5)
+    ap.add_argument("--backoff", type=float, default=2.0, help="base retry delay in seconds")
+    ap.add_argument("--max-crashes", type=int, default=3,
+                    help="give up on a file after this many worker-process crashes while it was in flight")
+    ap.add_argument("--corpus", help="also append extracted text to this corpus_store directory")
+    ap.add_argument("--screen", type=float, metavar="MIN_YEARS",
+                    help="print completed resumes with at least MIN_YEARS of experience and exit")
+    ap.add_argument("--max-years", type=float, help="upper tenure bound for --screen")
+    args = ap.parse_args()
+
+    if args.screen is not None:
+        queue = WorkQueue(args.db, read_only=True)
+        for path, years, result in queue.screen(args.screen, args.max_years):
+            print(f"{years:>5.1f} yrs  ATS {result.get('ats_score', '-'):>3}  {path}")
+        return
+
+    if not args.folder:
+        ap.error("the folder to watch is required unless --screen is given")
+    jd_text = ""
+    if args.jd:
+        with open(args.jd, encoding="utf-8") as fh:
+            jd_text = fh.read()
+    run(args.folder, args.db, jd_text=jd_text, workers=args.workers,
+        poll_interval=args.poll_interval, report_interval=args.report_interval,
+        max_attempts=args.max_attempts, backoff=args.backoff, corpus_dir=args.corpus,
+        max_crashes=args.max_crashes)
+
+
+if __name__ == "__main__":
+    main()